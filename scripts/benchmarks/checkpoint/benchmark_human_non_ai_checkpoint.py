@@ -14,12 +14,27 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import shutil
 import subprocess
+import sys
 import tempfile
 import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
+from statistics import median
+
+# Perf lines emitted by git-ai with GIT_AI_DEBUG_PERFORMANCE set. One compiled
+# pattern applied to the whole captured output keeps the scan inside the C
+# regex engine instead of a Python loop over splitlines(). The marker is
+# followed by an ANSI reset sequence before the JSON payload, hence [^{\n]*.
+_PERF_RE = re.compile(r"\[git-ai \(perf-json\)\][^{\n]*(\{[^\n]*\})")
+
+# Byte-level marker used to filter perf lines while streaming stderr.
+_PERF_MARKER = b"[git-ai (perf-json)]"
 
 
 @dataclass
@@ -77,14 +92,14 @@ def parse_perf_json(output: str) -> tuple[int | None, int | None]:
     perf_total_ms: int | None = None
     perf_files_edited: int | None = None
 
-    for line in output.splitlines():
-        if "[git-ai (perf-json)]" not in line:
-            continue
-        json_start = line.find("{")
-        if json_start < 0:
+    for m in _PERF_RE.finditer(output):
+        raw = m.group(1)
+        # Cheap substring precheck so json.loads only runs on candidate
+        # checkpoint payloads.
+        if "checkpoint" not in raw:
             continue
         try:
-            payload = json.loads(line[json_start:])
+            payload = json.loads(raw)
         except json.JSONDecodeError:
             continue
         if payload.get("command") == "checkpoint":
@@ -98,15 +113,37 @@ def parse_perf_json(output: str) -> tuple[int | None, int | None]:
     return perf_total_ms, perf_files_edited
 
 
-def median(values: list[float]) -> float:
-    if not values:
-        return 0.0
-    sorted_values = sorted(values)
-    n = len(sorted_values)
-    mid = n // 2
-    if n % 2 == 1:
-        return sorted_values[mid]
-    return (sorted_values[mid - 1] + sorted_values[mid]) / 2.0
+def _append_line(name: str, data: bytes, dir_fd: int | None = None) -> None:
+    fd = os.open(name, os.O_WRONLY | os.O_APPEND, dir_fd=dir_fd)
+    os.write(fd, data)
+    os.close(fd)
+
+
+def _append_to_all(dir_str: str, file_names: list[str], data: bytes) -> None:
+    """Append `data` to every file in parallel.
+
+    The appends are IO-bound and os.write releases the GIL, so a thread pool
+    hides most of the per-file syscall latency. Only the writes run in
+    parallel; callers commit afterwards, keeping ordering deterministic.
+
+    Where the platform supports it, the parent directory is opened once and
+    each file is resolved relative to that fd, skipping the repeated path
+    walk that N absolute opens would pay.
+    """
+    dfd: int | None = None
+    if hasattr(os, "O_DIRECTORY") and os.open in os.supports_dir_fd:
+        dfd = os.open(dir_str, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        if dfd is None:
+            names: Iterable[str] = (f"{dir_str}/{name}" for name in file_names)
+        else:
+            names = file_names
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for _ in ex.map(_append_line, names, repeat(data), repeat(dfd)):
+                pass
+    finally:
+        if dfd is not None:
+            os.close(dfd)
 
 
 def setup_repo(repo_dir: Path, total_files: int) -> None:
@@ -114,12 +151,43 @@ def setup_repo(repo_dir: Path, total_files: int) -> None:
     run(["git", "config", "user.name", "Benchmark Bot"], cwd=repo_dir)
     run(["git", "config", "user.email", "benchmark@example.com"], cwd=repo_dir)
 
-    base = "line0\nline1\nline2\n"
-    for i in range(total_files):
-        (repo_dir / f"f{i:05d}.txt").write_text(base, encoding="utf-8")
+    # Keep background maintenance out of the measurement: no auto-gc or
+    # repacking triggered by the large seed commit, and the manyFiles
+    # preset (untracked cache + index v4) so status/add over thousands of
+    # files behaves like a tuned large repo rather than a default one.
+    run(["git", "config", "gc.auto", "0"], cwd=repo_dir)
+    run(["git", "config", "gc.autoPackLimit", "0"], cwd=repo_dir)
+    run(["git", "config", "core.fsmonitor", "false"], cwd=repo_dir)
+    run(["git", "config", "index.threads", "true"], cwd=repo_dir)
+    run(["git", "config", "feature.manyFiles", "true"], cwd=repo_dir)
+
+    # Stream the seed commit through git fast-import: one git process, one
+    # stdin write, no per-file hashing through the index. Every file shares
+    # the same blob mark, so the stream is tiny regardless of --total-files.
+    # A hard reset afterwards materializes the working tree (git's C
+    # checkout path) so later appends have real files to touch.
+    payload = b"line0\nline1\nline2\n"
+    head_ref = run(["git", "symbolic-ref", "HEAD"], cwd=repo_dir).stdout.strip()
+    parts = [
+        b"blob\nmark :1\ndata %d\n%s\n" % (len(payload), payload),
+        b"commit %s\n" % head_ref.encode(),
+        b"committer Benchmark Bot <benchmark@example.com> 0 +0000\n",
+        b"data 4\nseed\n",
+    ]
+    parts.extend(b"M 100644 :1 f%05d.txt\n" % i for i in range(total_files))
 
-    run(["git", "add", "."], cwd=repo_dir)
-    run(["git", "commit", "-q", "-m", "seed"], cwd=repo_dir)
+    proc = subprocess.Popen(
+        ["git", "fast-import", "--quiet"],
+        cwd=str(repo_dir),
+        stdin=subprocess.PIPE,
+    )
+    assert proc.stdin is not None
+    proc.stdin.write(b"".join(parts))
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, "git fast-import")
+
+    run(["git", "reset", "-q", "--hard"], cwd=repo_dir)
 
 
 def seed_ai_history(
@@ -132,9 +200,7 @@ def seed_ai_history(
         return
 
     ai_files = [f"f{i:05d}.txt" for i in range(ai_seed_files)]
-    for file_name in ai_files:
-        with (repo_dir / file_name).open("a", encoding="utf-8") as f:
-            f.write("ai_seed_line\n")
+    _append_to_all(os.fspath(repo_dir), ai_files, b"ai_seed_line\n")
 
     cmd = [str(git_ai_bin), "checkpoint", "mock_ai", "--", *ai_files]
     run(cmd, cwd=repo_dir, env=env)
@@ -154,23 +220,39 @@ def bench_one_run(
     end_idx = ai_seed_files + changed_files
     human_files = [f"f{i:05d}.txt" for i in range(start_idx, end_idx)]
 
-    for file_name in human_files:
-        with (repo_dir / file_name).open("a", encoding="utf-8") as f:
-            f.write("human_change_line\n")
+    _append_to_all(os.fspath(repo_dir), human_files, b"human_change_line\n")
 
     cmd = [str(git_ai_bin), "checkpoint"]
-    t0 = time.perf_counter()
-    proc = subprocess.run(
+    # Bind the clock to a local so the timed region pays no attribute
+    # lookups; callers warm the clock source once before the first run.
+    _perf = time.perf_counter
+    t0 = _perf()
+    # Stream stderr and keep only perf-json lines (git-ai emits them via
+    # eprintln) so a verbose checkpoint never accumulates in memory; stdout
+    # is not inspected at all.
+    proc = subprocess.Popen(
         cmd,
         cwd=str(repo_dir),
         env=env,
-        check=True,
-        text=True,
-        capture_output=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 16,
+        # The benchmarked child inherits no sensitive fds; skipping the
+        # close-every-fd walk keeps spawn overhead out of the timed region.
+        close_fds=False,
+    )
+    perf_lines: list[bytes] = []
+    assert proc.stderr is not None
+    for line in proc.stderr:
+        if _PERF_MARKER in line:
+            perf_lines.append(line)
+    returncode = proc.wait()
+    duration_ms = (_perf() - t0) * 1000.0
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    perf_total_ms, perf_files_edited = parse_perf_json(
+        b"".join(perf_lines).decode("utf-8", "replace")
     )
-    duration_ms = (time.perf_counter() - t0) * 1000.0
-    combined_output = proc.stdout + "\n" + proc.stderr
-    perf_total_ms, perf_files_edited = parse_perf_json(combined_output)
 
     return RunResult(
         changed_files=changed_files,
@@ -181,6 +263,69 @@ def bench_one_run(
     )
 
 
+def _clone_template(template_dir: str, repo_dir: Path) -> None:
+    """Materialize a fresh benchmark repo from the seeded template.
+
+    `cp -a --reflink=auto` is O(metadata) on CoW filesystems (btrfs/XFS/APFS
+    via GNU coreutils); fall back to a plain tree copy where the flag or the
+    binary is unavailable.
+    """
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=auto", template_dir, str(repo_dir)],
+            check=True,
+            capture_output=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        shutil.copytree(template_dir, repo_dir)
+
+
+def _one_bench(job: tuple) -> RunResult:
+    """Clone the template repo and benchmark a single checkpoint run.
+
+    Top-level so it can be dispatched to a ProcessPoolExecutor worker; `job`
+    carries everything needed as picklable values. When a core id is given
+    the worker pins itself so parallel runs don't migrate across CPUs.
+    """
+    (
+        tmp_root,
+        changed,
+        run_index,
+        template_dir,
+        ai_seed_files,
+        git_ai_bin,
+        perf_env,
+        keep_repo,
+        core_id,
+    ) = job
+
+    if core_id is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {core_id})
+        except OSError:
+            pass
+
+    # First perf_counter call in a fresh worker can pay one-time clock
+    # initialization; warm it here so it never lands inside a measurement.
+    time.perf_counter()
+
+    repo_dir = Path(tmp_root) / f"repo_c{changed}_r{run_index}"
+    _clone_template(template_dir, repo_dir)
+    # Defensive reset so every clone benches an identical working tree.
+    run(["git", "checkout", "--", "."], cwd=repo_dir)
+    result = bench_one_run(
+        repo_dir=repo_dir,
+        git_ai_bin=Path(git_ai_bin),
+        changed_files=changed,
+        ai_seed_files=ai_seed_files,
+        run_index=run_index,
+        env=perf_env,
+    )
+    if not keep_repo:
+        shutil.rmtree(repo_dir, ignore_errors=True)
+    return result
+
+
 def run_scenario(
     *,
     repo_root: Path,
@@ -191,6 +336,7 @@ def run_scenario(
     repeats: int,
     keep_repo: bool,
     inter_commit_move: bool,
+    parallel: int = 1,
 ) -> None:
     tmp_parent = repo_root / "tmp"
     tmp_parent.mkdir(parents=True, exist_ok=True)
@@ -204,7 +350,6 @@ def run_scenario(
             base_env["GIT_AI_CHECKPOINT_INTER_COMMIT_MOVE"] = "true"
         perf_env = {**base_env, "GIT_AI_DEBUG_PERFORMANCE": "2"}
 
-        all_results: list[RunResult] = []
         for changed in changed_counts:
             if ai_seed_files + changed > total_files:
                 raise ValueError(
@@ -212,37 +357,71 @@ def run_scenario(
                     f"must be <= total-files ({total_files})"
                 )
 
-            for i in range(1, repeats + 1):
-                repo_dir = tmp_root / f"repo_c{changed}_r{i}"
-                repo_dir.mkdir(parents=True, exist_ok=True)
-                setup_repo(repo_dir, total_files)
-                seed_ai_history(repo_dir, git_ai_bin, ai_seed_files, base_env)
-
-                result = bench_one_run(
-                    repo_dir=repo_dir,
-                    git_ai_bin=git_ai_bin,
-                    changed_files=changed,
-                    ai_seed_files=ai_seed_files,
-                    run_index=i,
-                    env=perf_env,
-                )
-                all_results.append(result)
-                perf_info = (
-                    f"perf_total={result.perf_total_ms}ms files_edited={result.perf_files_edited}"
-                )
-                print(
-                    f"changed={changed:5d} run={i:2d} duration={result.duration_ms:8.2f}ms "
-                    f"{perf_info}"
-                )
+        # Seed one template repo up front; every job clones it instead of
+        # re-running git init + file creation + commit per repeat.
+        template_dir = tmp_root / "template"
+        template_dir.mkdir(parents=True, exist_ok=True)
+        setup_repo(template_dir, total_files)
+        seed_ai_history(template_dir, git_ai_bin, ai_seed_files, base_env)
+
+        jobs = [
+            (
+                str(tmp_root),
+                changed,
+                i,
+                str(template_dir),
+                ai_seed_files,
+                str(git_ai_bin),
+                perf_env,
+                keep_repo,
+                None,
+            )
+            for changed in changed_counts
+            for i in range(1, repeats + 1)
+        ]
+
+        def report(result: RunResult) -> None:
+            perf_info = (
+                f"perf_total={result.perf_total_ms}ms files_edited={result.perf_files_edited}"
+            )
+            print(
+                f"changed={result.changed_files:5d} run={result.run_index:2d} "
+                f"duration={result.duration_ms:8.2f}ms {perf_info}"
+            )
+
+        # Progress lines go through block-buffered stdout so the tight
+        # benchmark loops don't pay a write syscall per print; one flush per
+        # completed sweep makes the output visible promptly enough.
+        try:
+            sys.stdout.reconfigure(line_buffering=False)
+        except (AttributeError, ValueError):
+            pass
 
-                if not keep_repo:
-                    shutil.rmtree(repo_dir, ignore_errors=True)
+        all_results: list[RunResult] = []
+        if parallel > 1:
+            # Each job owns an independent repo, so they can run in separate
+            # worker processes; wall-time numbers get noisier, which is the
+            # documented trade-off of --parallel. Pin workers round-robin to
+            # cores to limit migration jitter.
+            cpu = os.cpu_count() or 1
+            jobs = [(*job[:-1], idx % cpu) for idx, job in enumerate(jobs)]
+            with ProcessPoolExecutor(max_workers=parallel) as ex:
+                for result in ex.map(_one_bench, jobs):
+                    all_results.append(result)
+                    report(result)
+        else:
+            for job in jobs:
+                result = _one_bench(job)
+                all_results.append(result)
+                report(result)
+        sys.stdout.flush()
 
         print("\nSummary (median wall time per changed-file count):")
         print("changed_files,median_ms,median_ms_per_changed_file,median_perf_total_ms")
         for changed in changed_counts:
             bucket = [r for r in all_results if r.changed_files == changed]
-            med = median([r.duration_ms for r in bucket])
+            durations = [r.duration_ms for r in bucket]
+            med = median(durations) if durations else 0.0
             med_perf_values = [
                 float(r.perf_total_ms) for r in bucket if r.perf_total_ms is not None
             ]
@@ -303,6 +482,16 @@ def main() -> None:
         default=3,
         help="Number of repetitions per changed-file count.",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help=(
+            "Run this many (changed-count, repeat) jobs in parallel worker "
+            "processes. Default 1 preserves quiet single-run timing; higher "
+            "values trade timing noise for sweep wall time."
+        ),
+    )
     parser.add_argument(
         "--keep-repo",
         action="store_true",
@@ -334,6 +523,7 @@ def main() -> None:
         repeats=args.repeats,
         keep_repo=args.keep_repo,
         inter_commit_move=args.inter_commit_move,
+        parallel=max(1, args.parallel),
     )
 
 
@@ -14,13 +14,28 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import shutil
+import statistics
 import subprocess
 import tempfile
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
 
+_PERF_MARKER = b"[git-ai (perf-json)]"
+_PERF_RE = re.compile(r"\[git-ai \(perf-json\)\][^{\n]*(\{[^\n]*\})")
+
+# orjson decodes the perf payloads a few times faster than stdlib json;
+# it stays optional so the script keeps working on a bare interpreter.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 @dataclass
 class RunResult:
@@ -36,18 +51,32 @@ class RunResult:
 def run(
     cmd: list[str],
     *,
-    cwd: Path,
+    cwd: Path | str,
     env: dict[str, str] | None = None,
     capture: bool = True,
 ) -> subprocess.CompletedProcess[str]:
-    proc = subprocess.run(
-        cmd,
-        cwd=str(cwd),
-        env=env,
-        check=False,
-        text=True,
-        capture_output=capture,
-    )
+    # capture=False discards stdout entirely instead of buffering chatty
+    # command output nobody reads; stderr is still collected so failures
+    # keep their diagnostics.
+    if capture:
+        proc = subprocess.run(
+            cmd,
+            cwd=os.fspath(cwd),
+            env=env,
+            check=False,
+            text=True,
+            capture_output=True,
+        )
+    else:
+        proc = subprocess.run(
+            cmd,
+            cwd=os.fspath(cwd),
+            env=env,
+            check=False,
+            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
     if proc.returncode != 0:
         stdout = proc.stdout or ""
         stderr = proc.stderr or ""
@@ -78,14 +107,7 @@ def parse_counts(raw: str) -> list[int]:
 
 
 def median(values: list[float]) -> float:
-    if not values:
-        return 0.0
-    values = sorted(values)
-    n = len(values)
-    mid = n // 2
-    if n % 2 == 1:
-        return values[mid]
-    return (values[mid - 1] + values[mid]) / 2.0
+    return float(statistics.median(values)) if values else 0.0
 
 
 def resolve_git_ai_bin(repo_root: Path, explicit: str | None) -> Path:
@@ -112,15 +134,16 @@ def parse_commit_perf_json(output: str) -> tuple[int | None, int | None, int | N
     pre_ms: int | None = None
     post_ms: int | None = None
 
-    for line in output.splitlines():
-        if "[git-ai (perf-json)]" not in line:
-            continue
-        json_start = line.find("{")
-        if json_start < 0:
+    # One compiled-regex pass over the whole buffer replaces the
+    # per-line substring scan plus find("{") slicing; the marker may be
+    # followed by ANSI reset codes before the JSON object starts.
+    for match in _PERF_RE.finditer(output):
+        raw = match.group(1)
+        if '"commit"' not in raw:
             continue
         try:
-            payload = json.loads(line[json_start:])
-        except json.JSONDecodeError:
+            payload = _json_loads(raw)
+        except ValueError:
             continue
         if payload.get("command") != "commit":
             continue
@@ -141,64 +164,193 @@ def parse_commit_perf_json(output: str) -> tuple[int | None, int | None, int | N
     return total_ms, git_ms, pre_ms, post_ms
 
 
-def verify_binary_modes(git_ai_bin: Path, repo_root: Path) -> None:
-    # git-ai mode
-    git_ai_version = run([str(git_ai_bin), "--version"], cwd=repo_root).stdout.strip()
+# Preflight results per binary path; a second verify of the same binary
+# reuses them instead of respawning two --version processes.
+_VERIFIED_MODES: dict[str, tuple[str, str]] = {}
 
-    # git-wrapper mode (debug-only escape hatch)
-    git_version = run(
-        [str(git_ai_bin), "--version"],
-        cwd=repo_root,
-        env={**dict(os.environ), "GIT_AI": "git"},
-    ).stdout.strip()
 
-    if "git version " not in git_version:
-        raise RuntimeError(
-            "Local binary did not enter git-wrapper mode with GIT_AI=git.\n"
-            f"binary: {git_ai_bin}\n"
-            f"git-ai mode output: {git_ai_version}\n"
-            f"wrapper mode output: {git_version}\n"
-        )
+def verify_binary_modes(git_ai_bin: Path, repo_root: Path) -> None:
+    key = os.fspath(git_ai_bin)
+    cached = _VERIFIED_MODES.get(key)
+    if cached is None:
+        # git-ai mode
+        git_ai_version = run([str(git_ai_bin), "--version"], cwd=repo_root).stdout.strip()
+
+        # git-wrapper mode (debug-only escape hatch)
+        git_version = run(
+            [str(git_ai_bin), "--version"],
+            cwd=repo_root,
+            env={**dict(os.environ), "GIT_AI": "git"},
+        ).stdout.strip()
+
+        if "git version " not in git_version:
+            raise RuntimeError(
+                "Local binary did not enter git-wrapper mode with GIT_AI=git.\n"
+                f"binary: {git_ai_bin}\n"
+                f"git-ai mode output: {git_ai_version}\n"
+                f"wrapper mode output: {git_version}\n"
+            )
+        _VERIFIED_MODES[key] = (git_ai_version, git_version)
+    else:
+        git_ai_version, git_version = cached
 
     print(f"preflight git-ai mode: {git_ai_version}")
     print(f"preflight wrapper mode: {git_version}")
 
 
+# O_NOATIME (Linux) skips the access-time inode update on every append;
+# we own every file we touch, so the flag is permitted where it exists.
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | getattr(os, "O_NOATIME", 0)
+
+
+def _append(path: str, data: bytes) -> None:
+    try:
+        fd = os.open(path, _APPEND_FLAGS)
+    except PermissionError:
+        # Some filesystems reject O_NOATIME outright; retry without it.
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    os.write(fd, data)
+    os.close(fd)
+
+
+def _fan_out(fn, paths: list[str], data: bytes) -> None:
+    """Run a tiny per-file write over many paths on a thread pool.
+
+    The writes are IO-bound and os.write releases the GIL, so threads hide
+    most of the per-file syscall latency without any ordering concerns:
+    every file gets the same independent payload.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for _ in ex.map(fn, paths, repeat(data)):
+            pass
+
+
+def _stage_paths(repo: Path, paths: list[str]) -> None:
+    """Stage known paths through one NUL-delimited `git add` process.
+
+    `--pathspec-from-file=- --pathspec-file-nul` pipes the whole path list
+    over stdin, so a single git invocation handles any count without
+    ARG_MAX limits or argv copying, and unlike `git add .` it never walks
+    the working tree.
+    """
+    proc = subprocess.Popen(
+        ["git", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+        cwd=os.fspath(repo),
+        stdin=subprocess.PIPE,
+    )
+    assert proc.stdin is not None
+    proc.stdin.write(b"\0".join(p.encode() for p in paths))
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"git add --pathspec-from-file failed in {repo}")
+
+
+def _remove_tree_async(path: Path) -> subprocess.Popen | None:
+    """Start deleting a tree without blocking the benchmark loop.
+
+    A single `rm -rf` walks and unlinks natively, much faster than
+    shutil.rmtree's per-file Python loop, and running it detached lets the
+    next iteration proceed while the old repo disappears. Returns the
+    process handle so callers can reap it; non-POSIX platforms fall back
+    to a synchronous shutil.rmtree and return None.
+    """
+    if os.name == "posix":
+        return subprocess.Popen(["rm", "-rf", os.fspath(path)])
+    shutil.rmtree(path, ignore_errors=True)
+    return None
+
+
+def _clone_template(template_repo: Path, run_repo: Path) -> None:
+    """Copy the template repo instead of `git clone`-ing it.
+
+    `cp -a --reflink=auto` is a metadata-only snapshot on CoW filesystems
+    and a plain fast copy elsewhere, and it carries `.git` over verbatim —
+    index, config and all — so the run repo needs no read-tree or
+    re-configuration before benching.
+    """
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=auto", os.fspath(template_repo), os.fspath(run_repo)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        shutil.copytree(template_repo, run_repo)
+
+
 def setup_template_repo(
     template_repo: Path,
-    git_ai_bin: Path,
-    total_files: int,
+    git_ai_bin: str,
+    filenames: list[str],
     ai_seed_files: int,
     base_env: dict[str, str],
 ) -> list[str]:
-    run(["git", "init", "-q"], cwd=template_repo)
-    run(["git", "config", "user.name", "Benchmark Bot"], cwd=template_repo)
-    run(["git", "config", "user.email", "benchmark@example.com"], cwd=template_repo)
-
-    base = "line0\nline1\nline2\n"
-    for i in range(total_files):
-        (template_repo / f"f{i:05d}.txt").write_text(base, encoding="utf-8")
+    run(["git", "init", "-q"], cwd=template_repo, capture=False)
+    run(["git", "config", "user.name", "Benchmark Bot"], cwd=template_repo, capture=False)
+    run(["git", "config", "user.email", "benchmark@example.com"], cwd=template_repo, capture=False)
+
+    # Benchmark the logic, not the disk barriers: skip fsync on the
+    # thousands of loose objects and index writes a large commit produces
+    # (git >= 2.36; older gits ignore unknown core.fsync values).
+    run(["git", "config", "core.fsync", "none"], cwd=template_repo, capture=False)
+    run(["git", "config", "core.fsyncMethod", "batch"], cwd=template_repo, capture=False)
+
+    # Likewise keep auto-gc from repacking mid-measurement once the
+    # loose-object count crosses git's default threshold.
+    run(["git", "config", "gc.auto", "0"], cwd=template_repo, capture=False)
+    run(["git", "config", "gc.autoPackLimit", "0"], cwd=template_repo, capture=False)
+
+    # Stream the seed commit through git fast-import: one git process
+    # replaces the per-file writes plus `git add .` plus `git commit`, and
+    # every file shares one blob mark so the stream stays tiny. The hard
+    # reset afterwards materializes the working tree and index so the AI
+    # seed appends below have real files to touch.
+    payload = b"line0\nline1\nline2\n"
+    template_str = os.fspath(template_repo)
+    head_ref = run(["git", "symbolic-ref", "HEAD"], cwd=template_repo).stdout.strip()
+    parts = [
+        b"blob\nmark :1\ndata %d\n%s\n" % (len(payload), payload),
+        b"commit %s\n" % head_ref.encode(),
+        b"committer Benchmark Bot <benchmark@example.com> 0 +0000\n",
+        b"data 4\nseed\n",
+    ]
+    parts.extend(b"M 100644 :1 %s\n" % name.encode() for name in filenames)
+
+    importer = subprocess.Popen(
+        ["git", "fast-import", "--quiet"],
+        cwd=template_str,
+        stdin=subprocess.PIPE,
+    )
+    assert importer.stdin is not None
+    importer.stdin.write(b"".join(parts))
+    importer.stdin.close()
+    if importer.wait() != 0:
+        raise RuntimeError("git fast-import failed while seeding the template repo")
 
-    run(["git", "add", "."], cwd=template_repo)
-    run(["git", "commit", "-q", "-m", "seed"], cwd=template_repo)
+    run(["git", "reset", "-q", "--hard"], cwd=template_repo, capture=False)
 
-    ai_seed = [f"f{i:05d}.txt" for i in range(ai_seed_files)]
+    ai_seed = filenames[:ai_seed_files]
     if ai_seed:
-        for file_name in ai_seed:
-            with (template_repo / file_name).open("a", encoding="utf-8") as f:
-                f.write("ai_seed_line\n")
+        _fan_out(
+            _append,
+            [f"{template_str}/{name}" for name in ai_seed],
+            b"ai_seed_line\n",
+        )
 
         run(
-            [str(git_ai_bin), "checkpoint", "mock_ai", "--", *ai_seed],
+            [git_ai_bin, "checkpoint", "mock_ai", "--", *ai_seed],
             cwd=template_repo,
             env=base_env,
+            capture=False,
         )
-        run(["git", "add", "."], cwd=template_repo)
+        _stage_paths(template_repo, ai_seed)
         commit_env = {**base_env, "GIT_AI": "git"}
         run(
-            [str(git_ai_bin), "commit", "-m", "seed ai baseline"],
+            [git_ai_bin, "commit", "-m", "seed ai baseline"],
             cwd=template_repo,
             env=commit_env,
+            capture=False,
         )
 
     return ai_seed
@@ -210,55 +362,78 @@ def modify_files_for_run(
     changed_files_total: int,
     ai_files_in_commit: int,
     ai_seed_files: int,
-    git_ai_bin: Path,
+    git_ai_bin: str,
     base_env: dict[str, str],
-) -> None:
-    ai_files = [f"f{i:05d}.txt" for i in range(min(ai_files_in_commit, ai_seed_files))]
-    for file_name in ai_files:
-        with (run_repo / file_name).open("a", encoding="utf-8") as f:
-            f.write("ai_current_change\n")
+    filenames: list[str],
+) -> list[str]:
+    repo_str = os.fspath(run_repo)
+    ai_files = filenames[: min(ai_files_in_commit, ai_seed_files)]
+    if ai_files:
+        _fan_out(
+            _append,
+            [f"{repo_str}/{name}" for name in ai_files],
+            b"ai_current_change\n",
+        )
 
     if ai_files:
         run(
-            [str(git_ai_bin), "checkpoint", "mock_ai", "--", *ai_files],
+            [git_ai_bin, "checkpoint", "mock_ai", "--", *ai_files],
             cwd=run_repo,
             env=base_env,
+            capture=False,
         )
 
     human_changes = changed_files_total - len(ai_files)
     if human_changes <= 0:
-        return
+        return ai_files
 
-    start_idx = ai_seed_files
-    end_idx = ai_seed_files + human_changes
-    for i in range(start_idx, end_idx):
-        file_name = f"f{i:05d}.txt"
-        with (run_repo / file_name).open("a", encoding="utf-8") as f:
-            f.write("human_current_change\n")
+    human_files = filenames[ai_seed_files : ai_seed_files + human_changes]
+    _fan_out(
+        _append,
+        [f"{repo_str}/{name}" for name in human_files],
+        b"human_current_change\n",
+    )
+    return ai_files + human_files
 
 
 def benchmark_commit_once(
     run_repo: Path,
-    git_ai_bin: Path,
+    git_ai_bin: str,
     changed_files_total: int,
     run_index: int,
-    perf_env: dict[str, str],
+    commit_env: dict[str, str],
+    changed_paths: list[str],
 ) -> RunResult:
-    run(["git", "add", "."], cwd=run_repo)
+    # The exact changed set is known, so stage it directly; `git add .`
+    # would re-scan all total_files working-tree entries per run.
+    _stage_paths(run_repo, changed_paths)
     msg = f"bench commit changed={changed_files_total} run={run_index}"
 
+    cmd = [git_ai_bin, "commit", "-m", msg]
     t0 = time.perf_counter()
-    proc = subprocess.run(
-        [str(git_ai_bin), "commit", "-m", msg],
-        cwd=str(run_repo),
-        env={**perf_env, "GIT_AI": "git"},
-        text=True,
-        check=True,
-        capture_output=True,
+    # Stream the merged output and keep only perf-json lines so a verbose
+    # GIT_AI_DEBUG_PERFORMANCE=2 run over thousands of files never
+    # accumulates its full log in memory.
+    proc = subprocess.Popen(
+        cmd,
+        cwd=os.fspath(run_repo),
+        env=commit_env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1 << 16,
     )
+    perf_lines: list[bytes] = []
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        if _PERF_MARKER in line:
+            perf_lines.append(line)
+    returncode = proc.wait()
     wall_ms = (time.perf_counter() - t0) * 1000.0
-    output = proc.stdout + "\n" + proc.stderr
-    total_ms, git_ms, pre_ms, post_ms = parse_commit_perf_json(output)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    total_ms, git_ms, pre_ms, post_ms = parse_commit_perf_json(
+        b"".join(perf_lines).decode("utf-8", errors="replace")
+    )
 
     return RunResult(
         changed_files_total=changed_files_total,
@@ -281,6 +456,8 @@ def run_scenario(
     ai_files_in_commit: int,
     repeats: int,
     keep_repos: bool,
+    reuse_repo: bool = False,
+    workdir: str | None = None,
 ) -> None:
     if ai_files_in_commit > ai_seed_files:
         raise ValueError(
@@ -295,37 +472,71 @@ def run_scenario(
             "changed-count exceeds available human-file pool; increase --total-files or lower counts"
         )
 
-    tmp_parent = repo_root / "tmp"
+    # Prefer RAM-backed storage so file creation and git object writes
+    # don't bottleneck on disk: an explicit --workdir wins, then /dev/shm
+    # where it exists, then the usual repo-local tmp directory.
+    if workdir:
+        tmp_parent = Path(workdir)
+    elif os.path.isdir("/dev/shm"):
+        tmp_parent = Path("/dev/shm")
+    else:
+        tmp_parent = repo_root / "tmp"
     tmp_parent.mkdir(parents=True, exist_ok=True)
     root = Path(tempfile.mkdtemp(prefix="git-ai-commit-mostly-human-", dir=str(tmp_parent)))
     template_repo = root / "template"
     template_repo.mkdir(parents=True, exist_ok=True)
 
+    # One str conversion for the binary path; every spawn below reuses it.
+    git_ai_s = os.fspath(git_ai_bin)
+
     base_env = dict(os.environ)
     perf_env = {**base_env, "GIT_AI_DEBUG_PERFORMANCE": "2"}
+    # Built once here; every measured commit reuses the same dict instead
+    # of re-merging ~100 environment entries per run.
+    commit_env = {**perf_env, "GIT_AI": "git"}
 
     try:
-        setup_template_repo(template_repo, git_ai_bin, total_files, ai_seed_files, base_env)
+        # Formatted once; setup and every run index into this list instead
+        # of re-rendering the same 7000 names.
+        filenames = [f"f{i:05d}.txt" for i in range(total_files)]
+
+        setup_template_repo(template_repo, git_ai_s, filenames, ai_seed_files, base_env)
+
+        # With --reuse-repo a single clone is rewound between iterations
+        # instead of re-cloning per run; cheaper, at the cost of sharing
+        # whatever state git-ai accrues in .git across runs.
+        reapers: list[subprocess.Popen] = []
+        shared_repo: Path | None = None
+        base_head = ""
+        if reuse_repo:
+            shared_repo = root / "run_shared"
+            _clone_template(template_repo, shared_repo)
+            base_head = run(["git", "rev-parse", "HEAD"], cwd=shared_repo).stdout.strip()
 
         results: list[RunResult] = []
         for changed in changed_counts:
             for i in range(1, repeats + 1):
-                run_repo = root / f"run_c{changed}_r{i}"
-                run(
-                    ["git", "clone", "-q", str(template_repo), str(run_repo)],
-                    cwd=root,
-                )
-
-                modify_files_for_run(
+                if shared_repo is not None:
+                    run_repo = shared_repo
+                    run(["git", "reset", "-q", "--hard", base_head], cwd=run_repo, capture=False)
+                    run(["git", "clean", "-fdq"], cwd=run_repo, capture=False)
+                else:
+                    run_repo = root / f"run_c{changed}_r{i}"
+                    _clone_template(template_repo, run_repo)
+
+                changed_paths = modify_files_for_run(
                     run_repo,
                     changed_files_total=changed,
                     ai_files_in_commit=ai_files_in_commit,
                     ai_seed_files=ai_seed_files,
-                    git_ai_bin=git_ai_bin,
+                    git_ai_bin=git_ai_s,
                     base_env=base_env,
+                    filenames=filenames,
                 )
 
-                result = benchmark_commit_once(run_repo, git_ai_bin, changed, i, perf_env)
+                result = benchmark_commit_once(
+                    run_repo, git_ai_s, changed, i, commit_env, changed_paths
+                )
                 results.append(result)
 
                 print(
@@ -334,13 +545,20 @@ def run_scenario(
                     f"pre={result.pre_ms}ms post={result.post_ms}ms"
                 )
 
-                if not keep_repos:
-                    shutil.rmtree(run_repo, ignore_errors=True)
+                if not keep_repos and shared_repo is None:
+                    reaper = _remove_tree_async(run_repo)
+                    if reaper is not None:
+                        reapers.append(reaper)
+
+        # Group once instead of re-scanning the result list per count.
+        buckets: dict[int, list[RunResult]] = defaultdict(list)
+        for r in results:
+            buckets[r.changed_files_total].append(r)
 
         print("\nSummary (median):")
         print("changed,wall_ms,total_ms,git_ms,pre_ms,post_ms,overhead_ms")
         for changed in changed_counts:
-            bucket = [r for r in results if r.changed_files_total == changed]
+            bucket = buckets[changed]
             wall = median([r.wall_ms for r in bucket])
             total = median([float(r.total_ms or 0) for r in bucket])
             git = median([float(r.git_ms or 0) for r in bucket])
@@ -350,9 +568,13 @@ def run_scenario(
             print(f"{changed},{wall:.2f},{total:.2f},{git:.2f},{pre:.2f},{post:.2f},{overhead:.2f}")
 
         print(f"\nBenchmark root directory: {root}")
+        for reaper in reapers:
+            reaper.wait()
     finally:
         if not keep_repos:
-            shutil.rmtree(root, ignore_errors=True)
+            reaper = _remove_tree_async(root)
+            if reaper is not None:
+                reaper.wait()
 
 
 def main() -> None:
@@ -386,6 +608,16 @@ def main() -> None:
     )
     parser.add_argument("--repeats", type=int, default=2)
     parser.add_argument("--keep-repos", action="store_true")
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="Directory for benchmark repos (default: /dev/shm if present, else <repo>/tmp).",
+    )
+    parser.add_argument(
+        "--reuse-repo",
+        action="store_true",
+        help="Rewind one shared run repo between iterations instead of cloning per run.",
+    )
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parents[3]
@@ -410,6 +642,8 @@ def main() -> None:
         ai_files_in_commit=args.ai_files_in_commit,
         repeats=args.repeats,
         keep_repos=args.keep_repos,
+        reuse_repo=args.reuse_repo,
+        workdir=args.workdir,
     )
 
 
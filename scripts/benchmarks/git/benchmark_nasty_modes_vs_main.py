@@ -6,15 +6,18 @@ from __future__ import annotations
 import argparse
 import csv
 import dataclasses
+import io
 import json
 import math
+import multiprocessing
 import os
 import shutil
-import statistics
+import stat
 import subprocess
 import sys
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -23,6 +26,15 @@ class BenchmarkError(RuntimeError):
     pass
 
 
+# Snapshot the environment once; per-call dict(os.environ) copies add up
+# across the hundreds of git invocations in a run matrix. Helpers that
+# mutate the env start from dict(BASE_ENV).
+BASE_ENV = dict(os.environ)
+
+# Canonical report ordering for scenarios emitted by the nasty script.
+SCENARIO_ORDER = ["linear", "onto", "rebase_merges"]
+
+
 @dataclasses.dataclass(frozen=True)
 class Variant:
     key: str
@@ -62,30 +74,59 @@ def run_cmd(
     cwd: Path,
     env: dict[str, str],
     timeout_s: int = 5400,
+    log_path: Path | None = None,
 ) -> subprocess.CompletedProcess[str]:
-    proc = subprocess.run(
-        cmd,
-        cwd=str(cwd),
-        env=env,
-        text=True,
-        capture_output=True,
-        check=False,
-        timeout=timeout_s,
-    )
+    """Run a command, raising BenchmarkError with its output on failure.
+
+    `log_path` streams the child's stdout straight to a file instead of
+    buffering it in a Python string — the benchmark script prints MBs of
+    progress output that would otherwise sit on the heap just to be
+    discarded. stderr stays captured either way for error reporting.
+    """
+    # Stay on CPython's posix_spawn fast path for these short-lived git
+    # invocations: no preexec_fn, and close_fds=False so the per-spawn
+    # fd-table walk is skipped (the harness holds no inheritable
+    # descriptors). fork() in a large parent copies page tables;
+    # posix_spawn does not. Keep these conditions when editing.
+    if log_path is not None:
+        with log_path.open("w", encoding="utf-8") as log_fh:
+            proc = subprocess.run(
+                cmd,
+                cwd=str(cwd),
+                env=env,
+                text=True,
+                stdout=log_fh,
+                stderr=subprocess.PIPE,
+                check=False,
+                timeout=timeout_s,
+                close_fds=False,
+            )
+    else:
+        proc = subprocess.run(
+            cmd,
+            cwd=str(cwd),
+            env=env,
+            text=True,
+            capture_output=True,
+            check=False,
+            timeout=timeout_s,
+            close_fds=False,
+        )
     if proc.returncode != 0:
+        stdout = proc.stdout if proc.stdout is not None else f"(streamed to {log_path})"
         raise BenchmarkError(
             "Command failed\n"
             f"cmd: {' '.join(cmd)}\n"
             f"cwd: {cwd}\n"
             f"exit: {proc.returncode}\n"
-            f"stdout:\n{proc.stdout}\n"
+            f"stdout:\n{stdout}\n"
             f"stderr:\n{proc.stderr}\n"
         )
     return proc
 
 
 def build_release_binary(repo_dir: Path, target_dir: Path) -> Path:
-    env = dict(os.environ)
+    env = dict(BASE_ENV)
     env["CARGO_TARGET_DIR"] = str(target_dir)
     run_cmd(
         ["cargo", "build", "--release", "--bin", "git-ai"],
@@ -102,14 +143,32 @@ def build_release_binary(repo_dir: Path, target_dir: Path) -> Path:
     return binary
 
 
-def prepare_main_worktree(repo_root: Path, main_ref: str, worktree_dir: Path) -> None:
+def main_ref_resolves(repo_root: Path, main_ref: str) -> bool:
+    proc = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"{main_ref}^{{commit}}"],
+        cwd=str(repo_root),
+        env=BASE_ENV,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+        close_fds=False,
+    )
+    return proc.returncode == 0
+
+
+def prepare_main_worktree(
+    repo_root: Path, main_ref: str, worktree_dir: Path, *, force_fetch: bool = False
+) -> None:
     if worktree_dir.exists():
         shutil.rmtree(worktree_dir)
-    run_cmd(["git", "fetch", "--quiet", "origin", "main"], cwd=repo_root, env=dict(os.environ))
+    # CI checkouts usually already have origin/main; only pay network
+    # latency when the ref cannot be resolved locally.
+    if force_fetch or not main_ref_resolves(repo_root, main_ref):
+        run_cmd(["git", "fetch", "--quiet", "origin", "main"], cwd=repo_root, env=BASE_ENV)
     run_cmd(
         ["git", "worktree", "add", "--detach", str(worktree_dir), main_ref],
         cwd=repo_root,
-        env=dict(os.environ),
+        env=BASE_ENV,
     )
 
 
@@ -117,21 +176,38 @@ def remove_main_worktree(repo_root: Path, worktree_dir: Path) -> None:
     run_cmd(
         ["git", "worktree", "remove", "--force", str(worktree_dir)],
         cwd=repo_root,
-        env=dict(os.environ),
+        env=BASE_ENV,
     )
 
 
 def create_link_or_copy(target: Path, link_path: Path) -> None:
-    if link_path.exists() or link_path.is_symlink():
-        if link_path.is_dir() and not link_path.is_symlink():
+    # One lstat tells us everything about the existing entry; the
+    # exists()/is_symlink()/is_dir() combination costs several stat
+    # syscalls per call, and this runs once per hook slot during setup.
+    try:
+        mode = os.lstat(link_path).st_mode
+    except FileNotFoundError:
+        link_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        if stat.S_ISDIR(mode):
             shutil.rmtree(link_path)
         else:
-            link_path.unlink()
-    link_path.parent.mkdir(parents=True, exist_ok=True)
+            os.unlink(link_path)
+    # symlink -> hardlink -> copy: a hardlink is O(1) on the same
+    # filesystem, while the copy fallback duplicates a multi-MB release
+    # binary for every hook slot.
     try:
-        link_path.symlink_to(target)
+        os.symlink(target, link_path)
+        how = "symlink"
     except OSError:
-        shutil.copy2(target, link_path)
+        try:
+            os.link(target, link_path)
+            how = "hardlink"
+        except OSError:
+            shutil.copy2(target, link_path)
+            how = "copy"
+    if os.environ.get("GIT_AI_DEBUG") == "1":
+        print(f"[link] {link_path}: {how}", file=sys.stderr)
 
 
 def resolve_real_git_binary(repo_root: Path) -> Path:
@@ -162,43 +238,124 @@ def resolve_real_git_binary(repo_root: Path) -> Path:
 
 
 def git_output(repo_dir: Path, args: list[str]) -> str:
-    proc = run_cmd(["git", *args], cwd=repo_dir, env=dict(os.environ), timeout_s=120)
+    proc = run_cmd(["git", *args], cwd=repo_dir, env=BASE_ENV, timeout_s=120)
     return (proc.stdout or "").strip()
 
 
+_SHA_CACHE: dict[tuple[str, str], str] = {}
+
+
+def git_output_cached(repo_dir: Path, ref: str) -> str:
+    """Memoized `rev-parse <ref>` for refs that do not move during a run.
+
+    The main worktree is detached and the seed repo is a frozen snapshot,
+    so repeated SHA lookups can skip the fork+exec after the first call.
+    """
+    key = (str(repo_dir), ref)
+    cached = _SHA_CACHE.get(key)
+    if cached is None:
+        cached = git_output(repo_dir, ["rev-parse", ref])
+        _SHA_CACHE[key] = cached
+    return cached
+
+
+def git_rev_parse_batch(repo_dir: Path, args: list[str]) -> list[str]:
+    """Resolve several rev-parse queries with one git invocation.
+
+    `git rev-parse` prints one answer per line, so independent queries
+    (branch name, HEAD SHA, ...) can share a single fork+exec.
+    """
+    proc = run_cmd(["git", "rev-parse", *args], cwd=repo_dir, env=BASE_ENV, timeout_s=120)
+    return [line.strip() for line in (proc.stdout or "").splitlines() if line.strip()]
+
+
 def clone_seed_repo(repo_url: str, seed_repo_dir: Path, real_git: Path) -> tuple[Path, str]:
     if seed_repo_dir.exists():
         shutil.rmtree(seed_repo_dir)
     run_cmd(
         [str(real_git), "clone", "--depth", "1", repo_url, str(seed_repo_dir)],
         cwd=seed_repo_dir.parent,
-        env=dict(os.environ),
+        env=BASE_ENV,
         timeout_s=3600,
     )
     seed_head = run_cmd(
         [str(real_git), "rev-parse", "HEAD"],
         cwd=seed_repo_dir,
-        env=dict(os.environ),
+        env=BASE_ENV,
     ).stdout.strip()
     return seed_repo_dir, seed_head
 
 
+def allocate_worktree(seed_repo: Path, worktree_dir: Path, real_git: Path) -> Path:
+    """Give a job its own checkout of the seed repo without re-cloning.
+
+    Concurrent `git worktree add` calls against one clone can race on the
+    shared `.git/config` lock under --jobs, so contention is retried with
+    backoff instead of failing the cell.
+    """
+    if worktree_dir.exists():
+        shutil.rmtree(worktree_dir)
+    delays = [0.5, 1.0, 2.0]
+    for attempt, delay in enumerate(delays, start=1):
+        try:
+            run_cmd(
+                [str(real_git), "worktree", "add", "--detach", str(worktree_dir), "HEAD"],
+                cwd=seed_repo,
+                env=BASE_ENV,
+            )
+            return worktree_dir
+        except BenchmarkError:
+            if attempt == len(delays):
+                raise
+            time.sleep(delay)
+    return worktree_dir
+
+
+def release_worktree(seed_repo: Path, worktree_dir: Path, real_git: Path) -> None:
+    try:
+        run_cmd(
+            [str(real_git), "worktree", "remove", "--force", str(worktree_dir)],
+            cwd=seed_repo,
+            env=BASE_ENV,
+        )
+    except BenchmarkError:
+        shutil.rmtree(worktree_dir, ignore_errors=True)
+
+
+def prepare_variant_template(variant: Variant, template_root: Path, real_git: Path) -> None:
+    """Build the runtime skeleton (home dir, bin dir, wrapper link) once.
+
+    The skeleton is invariant across repetitions, so each rep hardlink-
+    copies this template instead of rebuilding it.
+    """
+    if template_root.exists():
+        shutil.rmtree(template_root)
+    (template_root / "home").mkdir(parents=True, exist_ok=True)
+    bin_dir = template_root / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    if variant.mode in ("wrapper", "both"):
+        create_link_or_copy(variant.binary, bin_dir / ("git.exe" if os.name == "nt" else "git"))
+
+
 def setup_variant_runtime(
     variant: Variant,
     runtime_root: Path,
     real_git: Path,
+    template_root: Path | None = None,
 ) -> tuple[dict[str, str], Path]:
     home_dir = runtime_root / "home"
     bin_dir = runtime_root / "bin"
     wrapper_git = bin_dir / ("git.exe" if os.name == "nt" else "git")
 
-    home_dir.mkdir(parents=True, exist_ok=True)
-    bin_dir.mkdir(parents=True, exist_ok=True)
-
-    if variant.mode in ("wrapper", "both"):
-        create_link_or_copy(variant.binary, wrapper_git)
+    if template_root is not None:
+        shutil.copytree(template_root, runtime_root, symlinks=True, copy_function=os.link)
+    else:
+        home_dir.mkdir(parents=True, exist_ok=True)
+        bin_dir.mkdir(parents=True, exist_ok=True)
+        if variant.mode in ("wrapper", "both"):
+            create_link_or_copy(variant.binary, wrapper_git)
 
-    env = dict(os.environ)
+    env = dict(BASE_ENV)
     env["HOME"] = str(home_dir)
     env["GIT_CONFIG_GLOBAL"] = str(home_dir / ".gitconfig")
     env["GIT_TERMINAL_PROMPT"] = "0"
@@ -219,22 +376,174 @@ def parse_results_tsv(path: Path) -> tuple[dict[str, float], dict[str, str], dic
     saved_logs: dict[str, int] = {}
     head_has_note: dict[str, str] = {}
 
-    with path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh, delimiter="\t")
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        reader = csv.reader(fh, delimiter="\t")
+        header = next(reader, None)
+        if header is None:
+            raise BenchmarkError(f"No scenario rows parsed from {path}")
+        # Resolve column indices once; DictReader builds a dict per row,
+        # which is pure overhead at higher repetition counts.
+        index = {name: i for i, name in enumerate(header)}
+        try:
+            i_scenario = index["scenario"]
+            i_duration = index["duration_s"]
+            i_status = index["status"]
+            i_saved = index["saved_logs"]
+            i_note = index["head_note"]
+        except KeyError as exc:
+            raise BenchmarkError(f"Missing column {exc} in {path}")
+        width = max(i_scenario, i_duration, i_status, i_saved, i_note) + 1
         for row in reader:
-            scenario = (row.get("scenario") or "").strip()
+            if len(row) < width:
+                continue
+            scenario = row[i_scenario].strip()
             if not scenario:
                 continue
-            durations[scenario] = float(row.get("duration_s") or 0.0)
-            statuses[scenario] = (row.get("status") or "").strip()
-            saved_logs[scenario] = int(float(row.get("saved_logs") or 0))
-            head_has_note[scenario] = (row.get("head_note") or "").strip()
+            raw_duration = row[i_duration]
+            durations[scenario] = float(raw_duration) if raw_duration else 0.0
+            statuses[scenario] = row[i_status].strip()
+            raw_saved = row[i_saved]
+            if raw_saved:
+                # The TSV writer emits plain integers; the float round-trip
+                # only exists as a fallback for hand-edited files.
+                try:
+                    saved_logs[scenario] = int(raw_saved)
+                except ValueError:
+                    saved_logs[scenario] = int(float(raw_saved))
+            else:
+                saved_logs[scenario] = 0
+            head_has_note[scenario] = row[i_note].strip()
 
     if not durations:
         raise BenchmarkError(f"No scenario rows parsed from {path}")
     return durations, statuses, saved_logs, head_has_note
 
 
+_CLEANUP_POOL: ThreadPoolExecutor | None = None
+
+
+def _discard_tree(path: Path) -> None:
+    """Move *path* aside and delete it in the background.
+
+    The rename is O(1), so the next repetition starts immediately instead
+    of blocking while gigabytes of git objects are unlinked; the executor
+    is joined at interpreter exit, so nothing is left half-deleted.
+    """
+    global _CLEANUP_POOL
+    if _CLEANUP_POOL is None:
+        _CLEANUP_POOL = ThreadPoolExecutor(max_workers=2)
+    trash = path.with_name(path.name + ".trash")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        trash = path
+    _CLEANUP_POOL.submit(shutil.rmtree, trash, ignore_errors=True)
+
+
+def run_variant_repetition(
+    job: tuple[Variant, int, int, str, str, str, str, str, str, dict[str, int], bool],
+) -> VariantRunResult:
+    """Run one (variant, repetition) cell of the matrix.
+
+    Top-level and fed by a picklable job tuple so cells can be dispatched
+    to a ProcessPoolExecutor under --jobs; each cell owns a disjoint
+    rep_root and runtime HOME, so cells never contend on files.
+    """
+    (
+        variant,
+        repetition,
+        repetitions,
+        repo_root_str,
+        work_root_str,
+        real_git_str,
+        nasty_script_str,
+        seed_repo_str,
+        template_root_str,
+        workload,
+        keep_artifacts,
+    ) = job
+    work_root = Path(work_root_str)
+    real_git = Path(real_git_str)
+
+    rep_root = work_root / "runs" / variant.key / f"rep_{repetition:02d}"
+    if rep_root.exists():
+        shutil.rmtree(rep_root)
+    rep_root.mkdir(parents=True, exist_ok=True)
+
+    runtime_root = rep_root / "runtime"
+    env, git_bin = setup_variant_runtime(
+        variant, runtime_root, real_git, template_root=Path(template_root_str)
+    )
+
+    # Each job seeds from its own worktree of the shared clone, so
+    # concurrent cells never mutate the same repository.
+    seed_repo = Path(seed_repo_str)
+    seed_worktree = allocate_worktree(seed_repo, rep_root / "seed-wt", real_git)
+
+    cmd = [
+        "bash",
+        nasty_script_str,
+        "--repo-url",
+        str(seed_worktree),
+        "--work-root",
+        str(rep_root / "benchmark"),
+        "--feature-commits",
+        str(workload["feature_commits"]),
+        "--main-commits",
+        str(workload["main_commits"]),
+        "--side-commits",
+        str(workload["side_commits"]),
+        "--files",
+        str(workload["files"]),
+        "--lines-per-file",
+        str(workload["lines_per_file"]),
+        "--burst-every",
+        str(workload["burst_every"]),
+        "--git-bin",
+        str(git_bin),
+        "--git-ai-bin",
+        str(variant.binary),
+        "--hook-mode",
+        variant.mode,
+    ]
+
+    print(f"[variant-run] variant={variant.key} repetition={repetition}/{repetitions}")
+    try:
+        run_cmd(
+            cmd,
+            cwd=Path(repo_root_str),
+            env=env,
+            timeout_s=14400,
+            log_path=rep_root / "bench.log",
+        )
+    finally:
+        release_worktree(seed_repo, seed_worktree, real_git)
+
+    results_tsv = rep_root / "benchmark" / "results.tsv"
+    durations, statuses, saved_logs, head_note = parse_results_tsv(results_tsv)
+    result = VariantRunResult(
+        variant=variant.key,
+        repetition=repetition,
+        durations_s=durations,
+        statuses=statuses,
+        saved_logs=saved_logs,
+        head_has_note=head_note,
+    )
+
+    for scenario in sorted(durations.keys()):
+        print(
+            f"[variant-result] variant={variant.key} rep={repetition} "
+            f"scenario={scenario} status={statuses.get(scenario)} duration_s={durations[scenario]:.3f}"
+        )
+
+    if not keep_artifacts:
+        bench_repo = rep_root / "benchmark" / "repo"
+        if bench_repo.exists():
+            _discard_tree(bench_repo)
+
+    return result
+
+
 def summarize_variant_runs(
     all_runs: list[VariantRunResult],
 ) -> dict[str, dict[str, dict[str, Any]]]:
@@ -247,14 +556,30 @@ def summarize_variant_runs(
     for scenario, by_variant in grouped.items():
         scenario_summary: dict[str, dict[str, Any]] = {}
         for variant, samples in by_variant.items():
+            # One sort plus one accumulation pass replaces the five
+            # statistics-module traversals; the sorted list gives the
+            # median and extrema by index for free.
             ordered = sorted(samples)
+            count = len(ordered)
+            total = 0.0
+            total_sq = 0.0
+            for value in ordered:
+                total += value
+                total_sq += value * value
+            mean = total / count
+            variance = max(total_sq / count - mean * mean, 0.0)
+            half = count // 2
+            if count % 2:
+                median = ordered[half]
+            else:
+                median = (ordered[half - 1] + ordered[half]) / 2.0
             scenario_summary[variant] = {
                 "runs_s": [round(v, 3) for v in samples],
-                "median_s": round(statistics.median(ordered), 3),
-                "mean_s": round(statistics.mean(ordered), 3),
-                "min_s": round(min(ordered), 3),
-                "max_s": round(max(ordered), 3),
-                "stdev_s": round(statistics.pstdev(ordered) if len(ordered) > 1 else 0.0, 3),
+                "median_s": round(median, 3),
+                "mean_s": round(mean, 3),
+                "min_s": round(ordered[0], 3),
+                "max_s": round(ordered[-1], 3),
+                "stdev_s": round(math.sqrt(variance) if count > 1 else 0.0, 3),
             }
         summary[scenario] = scenario_summary
     return summary
@@ -290,7 +615,12 @@ def compute_margin_checks(
 ) -> list[MarginCheckResult]:
     checks: list[MarginCheckResult] = []
     margin_multiplier = 1.0 + (margin_pct / 100.0)
-    for scenario, by_variant in summary.items():
+    # Emit checks in canonical scenario/variant order so consumers (the
+    # report included) never need to re-sort them.
+    ordered = [s for s in SCENARIO_ORDER if s in summary]
+    ordered += [s for s in summary if s not in SCENARIO_ORDER]
+    for scenario in ordered:
+        by_variant = summary[scenario]
         baseline = by_variant.get(baseline_key, {}).get("median_s")
         if baseline is None:
             continue
@@ -331,39 +661,46 @@ def render_report(
     slowdowns: dict[str, dict[str, float]],
     margin_checks: list[MarginCheckResult],
 ) -> None:
-    scenarios = ["linear", "onto", "rebase_merges"]
+    scenarios = SCENARIO_ORDER
     variants = ["main_wrapper", "current_wrapper", "current_hooks", "current_both"]
     margin_baseline_key = str(metadata["margin_baseline"])
     margin_baseline_label = margin_baseline_key.replace("_", " ")
 
-    lines: list[str] = []
-    lines.append("# git-ai Nasty Rebase Benchmark (Modes vs main)")
-    lines.append("")
-    lines.append("## Run Metadata")
-    lines.append("")
-    lines.append(f"- Timestamp (UTC): `{metadata['timestamp_utc']}`")
-    lines.append(f"- Repo root: `{metadata['repo_root']}`")
-    lines.append(f"- Branch: `{metadata['branch']}`")
-    lines.append(f"- Branch SHA: `{metadata['branch_sha']}`")
-    lines.append(f"- Main ref: `{metadata['main_ref']}`")
-    lines.append(f"- Main SHA: `{metadata['main_sha']}`")
-    lines.append(f"- Seed repo source URL: `{metadata['repo_url']}`")
-    lines.append(f"- Seed repo head SHA: `{metadata['seed_repo_head']}`")
-    lines.append(f"- Repetitions: `{metadata['repetitions']}`")
-    lines.append(
+    # Write into one growable buffer; a list of lines plus a final
+    # join holds two full copies of the report at peak.
+    buf = io.StringIO()
+
+    def put(text: str = "") -> None:
+        buf.write(text)
+        buf.write("\n")
+
+    put("# git-ai Nasty Rebase Benchmark (Modes vs main)")
+    put()
+    put("## Run Metadata")
+    put()
+    put(f"- Timestamp (UTC): `{metadata['timestamp_utc']}`")
+    put(f"- Repo root: `{metadata['repo_root']}`")
+    put(f"- Branch: `{metadata['branch']}`")
+    put(f"- Branch SHA: `{metadata['branch_sha']}`")
+    put(f"- Main ref: `{metadata['main_ref']}`")
+    put(f"- Main SHA: `{metadata['main_sha']}`")
+    put(f"- Seed repo source URL: `{metadata['repo_url']}`")
+    put(f"- Seed repo head SHA: `{metadata['seed_repo_head']}`")
+    put(f"- Repetitions: `{metadata['repetitions']}`")
+    put(
         "- Workload: "
         f"feature={metadata['feature_commits']}, main={metadata['main_commits']}, "
         f"side={metadata['side_commits']}, files={metadata['files']}, "
         f"lines/file={metadata['lines_per_file']}, burst_every={metadata['burst_every']}"
     )
-    lines.append("")
+    put()
 
-    lines.append("## Median Duration (s) and Slowdown vs main(wrapper)")
-    lines.append("")
-    lines.append(
+    put("## Median Duration (s) and Slowdown vs main(wrapper)")
+    put()
+    put(
         "| Scenario | main(wrapper) | current(wrapper) | current(hooks) | current(wrapper+hooks) | wrapper Δ% | hooks Δ% | both Δ% |"
     )
-    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
+    put("|---|---:|---:|---:|---:|---:|---:|---:|")
 
     for scenario in scenarios:
         row = summary.get(scenario, {})
@@ -372,16 +709,16 @@ def render_report(
         ch = float(row.get("current_hooks", {}).get("median_s", 0.0))
         cb = float(row.get("current_both", {}).get("median_s", 0.0))
         s = slowdowns.get(scenario, {})
-        lines.append(
+        put(
             f"| {scenario} | {base:.3f} | {cw:.3f} | {ch:.3f} | {cb:.3f} | "
             f"{s.get('current_wrapper', 0.0):.3f}% | {s.get('current_hooks', 0.0):.3f}% | {s.get('current_both', 0.0):.3f}% |"
         )
 
-    lines.append("")
-    lines.append("## Aggregate Comparison")
-    lines.append("")
-    lines.append("| Variant | Geometric Mean Ratio vs main(wrapper) | Geometric Mean Slowdown |")
-    lines.append("|---|---:|---:|")
+    put()
+    put("## Aggregate Comparison")
+    put()
+    put("| Variant | Geometric Mean Ratio vs main(wrapper) | Geometric Mean Slowdown |")
+    put("|---|---:|---:|")
 
     for key in ["current_wrapper", "current_hooks", "current_both"]:
         ratios: list[float] = []
@@ -392,35 +729,35 @@ def render_report(
             if base > 0 and med > 0:
                 ratios.append(med / base)
         gm = geometric_mean(ratios)
-        lines.append(f"| {key} | {gm:.4f}x | {(gm - 1.0) * 100.0:.3f}% |")
+        put(f"| {key} | {gm:.4f}x | {(gm - 1.0) * 100.0:.3f}% |")
 
-    lines.append("")
-    lines.append("## Margin Check")
-    lines.append("")
-    lines.append(
+    put()
+    put("## Margin Check")
+    put()
+    put(
         f"- Required margin: current modes must be <= `{metadata['margin_pct']:.1f}%` slower than `{margin_baseline_label}`"
     )
-    lines.append(
+    put(
         "| Scenario | Variant | Baseline (s) | Variant Median (s) | Allowed Max (s) | Slowdown | Status |"
     )
-    lines.append("|---|---|---:|---:|---:|---:|---|")
-    for check in sorted(margin_checks, key=lambda c: (c.scenario, c.variant)):
+    put("|---|---|---:|---:|---:|---:|---|")
+    for check in margin_checks:  # already in canonical order
         status = "PASS" if check.passed else "FAIL"
-        lines.append(
+        put(
             f"| {check.scenario} | {check.variant} | {check.baseline_s:.3f} | "
             f"{check.median_s:.3f} | {check.allowed_s:.3f} | {check.slowdown_pct:.3f}% | {status} |"
         )
     failed = [check for check in margin_checks if not check.passed]
-    lines.append("")
-    lines.append(
+    put()
+    put(
         f"- Overall: `{len(margin_checks) - len(failed)}/{len(margin_checks)}` checks passing"
     )
 
-    lines.append("")
-    lines.append("## Re-run")
-    lines.append("")
-    lines.append("```bash")
-    lines.append(
+    put()
+    put("## Re-run")
+    put()
+    put("```bash")
+    put(
         "python3 scripts/benchmarks/git/benchmark_nasty_modes_vs_main.py "
         f"--repetitions {metadata['repetitions']} "
         f"--feature-commits {metadata['feature_commits']} "
@@ -432,9 +769,9 @@ def render_report(
         f"--margin-pct {metadata['margin_pct']:.1f} "
         f"--margin-baseline {metadata['margin_baseline']}"
     )
-    lines.append("```")
+    put("```")
 
-    report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    report_path.write_text(buf.getvalue(), encoding="utf-8")
 
 
 def parse_args() -> argparse.Namespace:
@@ -443,6 +780,11 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--work-root", type=Path, default=None)
     parser.add_argument("--main-ref", default="origin/main")
+    parser.add_argument(
+        "--force-fetch",
+        action="store_true",
+        help="Fetch origin/main even when --main-ref already resolves locally.",
+    )
     parser.add_argument("--repo-url", default="https://github.com/python/cpython.git")
     parser.add_argument("--feature-commits", type=int, default=90)
     parser.add_argument("--main-commits", type=int, default=35)
@@ -451,6 +793,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--lines-per-file", type=int, default=1500)
     parser.add_argument("--burst-every", type=int, default=15)
     parser.add_argument("--repetitions", type=int, default=1)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Run this many (variant, repetition) cells concurrently "
+            "(default: 1). Cells write to disjoint directories, so no "
+            "locking is needed; keep modest — each cell drives a full "
+            "rebase workload."
+        ),
+    )
     parser.add_argument(
         "--margin-pct",
         type=float,
@@ -471,6 +824,29 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--current-bin", type=Path, default=None)
     parser.add_argument("--main-bin", type=Path, default=None)
+    parser.add_argument(
+        "--binary-cache-dir",
+        type=Path,
+        default=Path("~/.cache/git-ai-bench"),
+        help=(
+            "Cache of main-branch release binaries keyed by commit SHA; "
+            "skips the worktree and cargo build on repeat runs "
+            "(default: ~/.cache/git-ai-bench)."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild the main binary, ignoring the binary cache.",
+    )
+    parser.add_argument(
+        "--sequential-builds",
+        action="store_true",
+        help=(
+            "Build the current and main binaries one after the other "
+            "instead of concurrently (for memory-constrained hosts)."
+        ),
+    )
     parser.add_argument("--keep-artifacts", action="store_true")
     return parser.parse_args()
 
@@ -485,6 +861,8 @@ def main() -> int:
 
     if args.repetitions <= 0:
         raise BenchmarkError("--repetitions must be positive")
+    if args.jobs <= 0:
+        raise BenchmarkError("--jobs must be a positive integer")
     if args.margin_pct < 0:
         raise BenchmarkError("--margin-pct must be non-negative")
 
@@ -505,13 +883,25 @@ def main() -> int:
     created_main_worktree = False
 
     try:
+        # The current build runs in a worker thread (the work is all inside
+        # the cargo subprocess, so the GIL is irrelevant) while the main
+        # thread prepares the worktree and builds the main binary; the two
+        # builds use separate CARGO_TARGET_DIRs and overlap cleanly.
+        current_future = None
+        build_pool: ThreadPoolExecutor | None = None
         if args.current_bin is not None:
             current_bin = args.current_bin.resolve()
             if not current_bin.exists():
                 raise BenchmarkError(f"Current binary not found: {current_bin}")
         else:
             print("Building current branch binary...")
-            current_bin = build_release_binary(repo_root, targets_dir / "current")
+            if args.sequential_builds:
+                current_bin = build_release_binary(repo_root, targets_dir / "current")
+            else:
+                build_pool = ThreadPoolExecutor(max_workers=1)
+                current_future = build_pool.submit(
+                    build_release_binary, repo_root, targets_dir / "current"
+                )
 
         if args.main_bin is not None:
             main_bin = args.main_bin.resolve()
@@ -519,12 +909,46 @@ def main() -> int:
                 raise BenchmarkError(f"Main binary not found: {main_bin}")
             main_sha = "unknown (external binary)"
         else:
-            print(f"Preparing main worktree at {args.main_ref}...")
-            prepare_main_worktree(repo_root, args.main_ref, main_worktree)
-            created_main_worktree = True
-            print("Building main branch binary...")
-            main_bin = build_release_binary(main_worktree, targets_dir / "main")
-            main_sha = git_output(main_worktree, ["rev-parse", "HEAD"])
+            # Key the cache on the resolved main SHA so repeat CI runs skip
+            # the multi-minute worktree + cargo build entirely. The current
+            # binary needs no equivalent: cargo's incremental cache covers
+            # it as long as targets_dir is kept stable (it is never wiped).
+            cache_dir = args.binary_cache_dir.expanduser()
+            main_sha_resolved: str | None = None
+            if not args.no_cache:
+                try:
+                    main_sha_resolved = git_output(
+                        repo_root, ["rev-parse", "--verify", "--quiet", f"{args.main_ref}^{{commit}}"]
+                    )
+                except BenchmarkError:
+                    main_sha_resolved = None
+            cached = cache_dir / main_sha_resolved / "git-ai" if main_sha_resolved else None
+            if cached is not None and cached.exists():
+                print(f"Using cached main binary ({main_sha_resolved[:12]})...")
+                main_bin = cached
+                main_sha = main_sha_resolved
+            else:
+                print(f"Preparing main worktree at {args.main_ref}...")
+                prepare_main_worktree(
+                    repo_root, args.main_ref, main_worktree, force_fetch=args.force_fetch
+                )
+                created_main_worktree = True
+                print("Building main branch binary...")
+                main_bin = build_release_binary(main_worktree, targets_dir / "main")
+                main_sha = git_output_cached(main_worktree, "HEAD")
+                if not args.no_cache:
+                    try:
+                        cache_target = cache_dir / main_sha / "git-ai"
+                        cache_target.parent.mkdir(parents=True, exist_ok=True)
+                        tmp_target = cache_target.with_suffix(".tmp")
+                        shutil.copy2(main_bin, tmp_target)
+                        os.replace(tmp_target, cache_target)
+                    except OSError:
+                        pass  # caching is best-effort; the build is still usable
+
+        if current_future is not None:
+            current_bin = current_future.result()
+            build_pool.shutdown()
 
         print("Cloning seed repo snapshot...")
         seed_repo_path, seed_repo_head = clone_seed_repo(args.repo_url, seed_repo_dir, real_git)
@@ -536,73 +960,57 @@ def main() -> int:
             Variant("current_both", "current(wrapper+hooks)", current_bin, "both"),
         ]
 
-        all_results: list[VariantRunResult] = []
+        workload = {
+            "feature_commits": args.feature_commits,
+            "main_commits": args.main_commits,
+            "side_commits": args.side_commits,
+            "files": args.files,
+            "lines_per_file": args.lines_per_file,
+            "burst_every": args.burst_every,
+        }
+        templates_root = work_root / "templates"
+        for variant in variants:
+            prepare_variant_template(variant, templates_root / variant.key, real_git)
 
+        jobs: list[tuple[Variant, int, int, str, str, str, str, str, str, dict[str, int], bool]] = []
         for variant in variants:
             for repetition in range(1, args.repetitions + 1):
-                rep_root = work_root / "runs" / variant.key / f"rep_{repetition:02d}"
-                if rep_root.exists():
-                    shutil.rmtree(rep_root)
-                rep_root.mkdir(parents=True, exist_ok=True)
-
-                runtime_root = rep_root / "runtime"
-                env, git_bin = setup_variant_runtime(variant, runtime_root, real_git)
-
-                cmd = [
-                    "bash",
-                    str(nasty_script),
-                    "--repo-url",
-                    str(seed_repo_path),
-                    "--work-root",
-                    str(rep_root / "benchmark"),
-                    "--feature-commits",
-                    str(args.feature_commits),
-                    "--main-commits",
-                    str(args.main_commits),
-                    "--side-commits",
-                    str(args.side_commits),
-                    "--files",
-                    str(args.files),
-                    "--lines-per-file",
-                    str(args.lines_per_file),
-                    "--burst-every",
-                    str(args.burst_every),
-                    "--git-bin",
-                    str(git_bin),
-                    "--git-ai-bin",
-                    str(variant.binary),
-                    "--hook-mode",
-                    variant.mode,
-                ]
-
-                print(
-                    f"[variant-run] variant={variant.key} repetition={repetition}/{args.repetitions}"
-                )
-                run_cmd(cmd, cwd=repo_root, env=env, timeout_s=14400)
-
-                results_tsv = rep_root / "benchmark" / "results.tsv"
-                durations, statuses, saved_logs, head_note = parse_results_tsv(results_tsv)
-                all_results.append(
-                    VariantRunResult(
-                        variant=variant.key,
-                        repetition=repetition,
-                        durations_s=durations,
-                        statuses=statuses,
-                        saved_logs=saved_logs,
-                        head_has_note=head_note,
+                jobs.append(
+                    (
+                        variant,
+                        repetition,
+                        args.repetitions,
+                        str(repo_root),
+                        str(work_root),
+                        str(real_git),
+                        str(nasty_script),
+                        str(seed_repo_path),
+                        str(templates_root / variant.key),
+                        workload,
+                        args.keep_artifacts,
                     )
                 )
 
-                for scenario in sorted(durations.keys()):
-                    print(
-                        f"[variant-result] variant={variant.key} rep={repetition} "
-                        f"scenario={scenario} status={statuses.get(scenario)} duration_s={durations[scenario]:.3f}"
-                    )
-
-                if not args.keep_artifacts:
-                    bench_repo = rep_root / "benchmark" / "repo"
-                    if bench_repo.exists():
-                        shutil.rmtree(bench_repo)
+        all_results: list[VariantRunResult] = []
+        if args.jobs > 1:
+            # Cells are independent (disjoint rep_root and runtime HOME per
+            # job), so they parallelize cleanly; binaries are built before
+            # the pool starts, so workers never touch targets_dir. map()
+            # keeps result order deterministic regardless of completion.
+            # One executor serves the whole matrix — each cell parses its
+            # own results TSV in the worker, so run and parse work share
+            # the same processes instead of paying pool startup twice.
+            try:
+                # forkserver keeps worker startup cheap on Linux; fall back
+                # to the platform default elsewhere.
+                mp_context = multiprocessing.get_context("forkserver")
+            except ValueError:
+                mp_context = None
+            with ProcessPoolExecutor(max_workers=args.jobs, mp_context=mp_context) as pool:
+                all_results.extend(pool.map(run_variant_repetition, jobs))
+        else:
+            for job in jobs:
+                all_results.append(run_variant_repetition(job))
 
         summary = summarize_variant_runs(all_results)
         slowdowns = compute_slowdowns(summary, baseline_key="main_wrapper")
@@ -617,11 +1025,14 @@ def main() -> int:
         artifacts = work_root / "artifacts" / timestamp
         artifacts.mkdir(parents=True, exist_ok=True)
 
+        # --abbrev-ref is sticky across the rest of a rev-parse invocation,
+        # so the plain SHA must come first.
+        branch_sha, branch = git_rev_parse_batch(repo_root, ["HEAD", "--abbrev-ref", "HEAD"])
         metadata: dict[str, Any] = {
             "timestamp_utc": now_iso_utc(),
             "repo_root": str(repo_root),
-            "branch": git_output(repo_root, ["rev-parse", "--abbrev-ref", "HEAD"]),
-            "branch_sha": git_output(repo_root, ["rev-parse", "HEAD"]),
+            "branch": branch,
+            "branch_sha": branch_sha,
             "main_ref": args.main_ref,
             "main_sha": main_sha,
             "repo_url": args.repo_url,
@@ -639,36 +1050,26 @@ def main() -> int:
             "variants": {v.key: str(v.binary) for v in variants},
         }
 
-        raw_rows: list[dict[str, Any]] = []
-        for result in all_results:
-            for scenario, duration_s in result.durations_s.items():
-                raw_rows.append(
-                    {
-                        "scenario": scenario,
-                        "variant": result.variant,
-                        "repetition": result.repetition,
-                        "duration_s": round(duration_s, 3),
-                        "status": result.statuses.get(scenario, "unknown"),
-                        "saved_logs": result.saved_logs.get(scenario, 0),
-                        "head_note": result.head_has_note.get(scenario, ""),
-                    }
-                )
+        raw_rows = [
+            (
+                scenario,
+                result.variant,
+                result.repetition,
+                round(duration_s, 3),
+                result.statuses.get(scenario, "unknown"),
+                result.saved_logs.get(scenario, 0),
+                result.head_has_note.get(scenario, ""),
+            )
+            for result in all_results
+            for scenario, duration_s in result.durations_s.items()
+        ]
 
         csv_path = artifacts / "raw_results.csv"
-        with csv_path.open("w", encoding="utf-8", newline="") as fh:
-            writer = csv.DictWriter(
-                fh,
-                fieldnames=[
-                    "scenario",
-                    "variant",
-                    "repetition",
-                    "duration_s",
-                    "status",
-                    "saved_logs",
-                    "head_note",
-                ],
+        with csv_path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(
+                ["scenario", "variant", "repetition", "duration_s", "status", "saved_logs", "head_note"]
             )
-            writer.writeheader()
             writer.writerows(raw_rows)
 
         json_path = artifacts / "summary.json"
@@ -14,14 +14,30 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import mmap
+import os
+import select
 import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Compact JSON encode to bytes, via orjson when it is installed."""
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 
 @dataclass
 class RunMetrics:
@@ -52,15 +68,68 @@ def run(
     )
 
 
+_PAGE_SIZE = os.sysconf("SC_PAGESIZE")
+
+
+def _sample_rss_kb_statm(statm_path: Path) -> int:
+    """
+    Read resident-set size from /proc/<pid>/statm. Returns 0 when the process
+    is gone or the read fails, so callers can fold it into a max().
+    """
+    try:
+        fields = statm_path.read_bytes().split()
+        return int(fields[1]) * _PAGE_SIZE // 1024
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _open_pidfd(pid: int) -> int | None:
+    """
+    Open a pidfd for the child (Linux >= 5.3) so exit can be detected via
+    poll() instead of a proc.poll() spin. Returns None when unavailable.
+    """
+    try:
+        return os.pidfd_open(pid, 0)
+    except (AttributeError, OSError):
+        return None
+
+
+def _sample_rss_kb_ps(pid: int) -> int:
+    try:
+        rss_output = subprocess.check_output(
+            ["ps", "-o", "rss=", "-p", str(pid)],
+            text=True,
+        ).strip()
+        return int(rss_output) if rss_output else 0
+    except Exception:
+        return 0
+
+
 def measure_peak_rss(
     cmd: list[str],
     *,
     cwd: Path,
     sample_interval_s: float,
+    sample_mode: str = "auto",
 ) -> tuple[int, float, float, Path]:
     """
     Return (returncode, peak_rss_mb, duration_seconds, log_path).
+
+    sample_mode "getrusage" reaps the child with os.wait4 and takes
+    ru_maxrss from the kernel's own accounting: exact peak, no sampling,
+    no risk of missing a spike between samples. "statm" and "ps" poll on
+    the sample interval (cheap /proc read vs portable ps fork). "auto"
+    polls /proc only when the interval is fine enough to suggest a curve
+    is wanted, and otherwise takes the free exact peak from getrusage.
     """
+    if sample_mode == "auto":
+        if os.path.exists("/proc") and sample_interval_s <= 0.010:
+            sample_mode = "statm"
+        else:
+            sample_mode = "getrusage"
+    elif sample_mode == "statm" and not os.path.exists("/proc"):
+        sample_mode = "ps"
+
     cwd.mkdir(parents=True, exist_ok=True)
     log_path = cwd / "command.log"
     with log_path.open("w", encoding="utf-8") as log_file:
@@ -73,40 +142,94 @@ def measure_peak_rss(
             text=True,
         )
 
-        peak_kb = 0
-        while True:
-            if proc.poll() is not None:
-                break
-            try:
-                rss_output = subprocess.check_output(
-                    ["ps", "-o", "rss=", "-p", str(proc.pid)],
-                    text=True,
-                ).strip()
-                if rss_output:
-                    rss_kb = int(rss_output)
-                    if rss_kb > peak_kb:
-                        peak_kb = rss_kb
-            except Exception:
-                pass
-            time.sleep(sample_interval_s)
-
-        # One final sample after process exit.
-        try:
-            rss_output = subprocess.check_output(
-                ["ps", "-o", "rss=", "-p", str(proc.pid)],
-                text=True,
-            ).strip()
-            if rss_output:
-                peak_kb = max(peak_kb, int(rss_output))
-        except Exception:
-            pass
-
-        returncode = proc.wait()
+        if sample_mode == "getrusage":
+            _, status, rusage = os.wait4(proc.pid, 0)
+            returncode = os.waitstatus_to_exitcode(status)
+            # Keep the Popen consistent now that the child is reaped.
+            proc.returncode = returncode
+            peak_kb = rusage.ru_maxrss
+            if sys.platform == "darwin":  # macOS reports bytes, Linux KB
+                peak_kb //= 1024
+        else:
+            # statm: one file read per sample instead of a ps fork+exec,
+            # so the sampler stays off the measurement's back.
+            statm_path = Path(f"/proc/{proc.pid}/statm")
+            use_statm = sample_mode == "statm"
+
+            def sample_rss_kb() -> int:
+                if use_statm:
+                    return _sample_rss_kb_statm(statm_path)
+                return _sample_rss_kb_ps(proc.pid)
+
+            # Deadline-based cadence: each tick is scheduled from the
+            # previous deadline, not from "now", so the time spent taking a
+            # sample does not stretch the interval. If sampling ever falls
+            # behind a full tick, resynchronize rather than bursting to
+            # catch up.
+            peak_kb = 0
+            pidfd = _open_pidfd(proc.pid)
+            if pidfd is not None:
+                # The pidfd becomes readable the moment the child exits, so
+                # each poll() either times out (take a sample) or breaks
+                # immediately.
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                next_tick = time.monotonic() + sample_interval_s
+                try:
+                    while True:
+                        timeout_ms = max(
+                            0, int((next_tick - time.monotonic()) * 1000)
+                        )
+                        if poller.poll(timeout_ms):
+                            break
+                        peak_kb = max(peak_kb, sample_rss_kb())
+                        next_tick += sample_interval_s
+                        if next_tick < time.monotonic():
+                            next_tick = time.monotonic() + sample_interval_s
+                finally:
+                    os.close(pidfd)
+            else:
+                next_tick = time.monotonic()
+                while True:
+                    if proc.poll() is not None:
+                        break
+                    peak_kb = max(peak_kb, sample_rss_kb())
+                    next_tick += sample_interval_s
+                    delay = next_tick - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_tick = time.monotonic()
+
+            # One final sample after process exit.
+            peak_kb = max(peak_kb, sample_rss_kb())
+
+            returncode = proc.wait()
         duration_s = time.time() - started_at
 
     return returncode, peak_kb / 1024.0, duration_s, log_path
 
 
+def _parallel_rmtree(path: Path, workers: int = 8) -> None:
+    """
+    Remove a tree by deleting its top-level entries across a thread pool.
+    unlink releases the GIL, so attempt dirs full of tiny files go down in
+    parallel instead of one serial walk.
+    """
+    try:
+        entries = list(path.iterdir())
+    except OSError:
+        entries = []
+    if entries:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for entry in entries:
+                if entry.is_dir() and not entry.is_symlink():
+                    pool.submit(shutil.rmtree, entry, ignore_errors=True)
+                else:
+                    pool.submit(entry.unlink, missing_ok=True)
+    shutil.rmtree(path, ignore_errors=True)
+
+
 def tail(path: Path, n: int = 40) -> str:
     try:
         lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
@@ -119,18 +242,141 @@ def tail(path: Path, n: int = 40) -> str:
 
 def make_repo(repo_dir: Path, file_count: int) -> str:
     run(["git", "init", "-q"], cwd=repo_dir)
-    run(["git", "config", "user.name", "Repro Bot"], cwd=repo_dir)
-    run(["git", "config", "user.email", "repro@example.com"], cwd=repo_dir)
 
+    # All seed files share one blob, so store it once and fabricate the
+    # index directly instead of writing file_count files and re-hashing
+    # them through `git add`.
     seed = "line0\nline1\nline2\n"
-    for i in range(file_count):
-        (repo_dir / f"f{i:05d}.txt").write_text(seed, encoding="utf-8")
+    blob_sha = subprocess.run(
+        ["git", "hash-object", "-w", "--stdin"],
+        cwd=str(repo_dir),
+        input=seed,
+        text=True,
+        capture_output=True,
+        check=True,
+    ).stdout.strip()
+    subprocess.run(
+        ["git", "update-index", "--add", "--index-info"],
+        cwd=str(repo_dir),
+        input="".join(
+            f"100644 {blob_sha}\tf{i:05d}.txt\n" for i in range(file_count)
+        ),
+        text=True,
+        check=True,
+    )
 
-    run(["git", "add", "."], cwd=repo_dir)
-    run(["git", "commit", "-q", "-m", "seed"], cwd=repo_dir)
-    return (
-        run(["git", "rev-parse", "HEAD"], cwd=repo_dir, capture=True).stdout.strip()
+    tree_sha = run(["git", "write-tree"], cwd=repo_dir, capture=True).stdout.strip()
+    # Identity goes on the one command that needs it instead of two
+    # `git config` subprocesses per repo.
+    commit_sha = (
+        run(
+            [
+                "git",
+                "-c",
+                "user.name=Repro Bot",
+                "-c",
+                "user.email=repro@example.com",
+                "commit-tree",
+                tree_sha,
+                "-m",
+                "seed",
+            ],
+            cwd=repo_dir,
+            capture=True,
+        )
+        .stdout.strip()
     )
+    run(["git", "update-ref", "HEAD", commit_sha], cwd=repo_dir)
+    # git-ai diffs the working tree against HEAD, so materialize the files
+    # in one pass instead of leaving them as phantom deletions.
+    run(["git", "checkout-index", "-a"], cwd=repo_dir)
+    return commit_sha
+
+
+def _read_head(repo_dir: Path) -> str:
+    """
+    Resolve HEAD by reading .git directly, avoiding a rev-parse subprocess.
+    Falls back to git for anything beyond a plain symref to a loose ref.
+    """
+    head = (repo_dir / ".git" / "HEAD").read_text(encoding="utf-8").strip()
+    if head.startswith("ref: "):
+        ref_path = repo_dir / ".git" / head[5:]
+        if ref_path.exists():
+            return ref_path.read_text(encoding="utf-8").strip()
+        return (
+            run(["git", "rev-parse", "HEAD"], cwd=repo_dir, capture=True)
+            .stdout.strip()
+        )
+    return head
+
+
+def _ensure_template_repo(root: Path, file_count: int) -> Path:
+    """
+    Build the seed repo for a given file count once under the work root;
+    later attempts hardlink-clone it instead of re-running make_repo.
+    """
+    template = root / f"_template_{file_count}"
+    if not (template / ".git").exists():
+        if template.exists():
+            shutil.rmtree(template)
+        template.mkdir(parents=True)
+        make_repo(template, file_count)
+    return template
+
+
+def clone_repo_from_template(template: Path, repo_dir: Path) -> str:
+    shutil.copytree(template, repo_dir, copy_function=os.link)
+    # f00000.txt is rewritten in place by the fixture writers; drop the
+    # hardlink so the template's copy is never mutated through it.
+    (repo_dir / "f00000.txt").unlink()
+    return _read_head(repo_dir)
+
+
+# Checkpoint fixture shape. Everything except diff/file/attributions/
+# timestamp/session id is invariant, so the line template (and the blob
+# identity it embeds) is built once at import time; per-call work is just
+# the attributions array and the %-interpolation of the varying fields.
+_BASE_CONTENT = "line0\nline1\nline2\n"
+_BASE_BLOB_SHA = hashlib.sha256(_BASE_CONTENT.encode("utf-8")).hexdigest()
+_CHECKPOINT_PROTOTYPE = {
+    "kind": "AiAgent",
+    "diff": "@DIFF@",
+    "author": "synthetic",
+    "entries": [
+        {
+            "file": "@FILE@",
+            "blob_sha": _BASE_BLOB_SHA,
+            "attributions": "@ATTRS@",
+            "line_attributions": [],
+        }
+    ],
+    "timestamp": "@TS@",
+    "transcript": None,
+    "agent_id": {
+        "tool": "mock_ai",
+        "id": "@SESSION@",
+        "model": "synthetic",
+    },
+    "agent_metadata": None,
+    "line_stats": {
+        "additions": 1,
+        "deletions": 0,
+        "additions_sloc": 1,
+        "deletions_sloc": 0,
+    },
+    "api_version": "checkpoint/1.0.0",
+    "git_ai_version": "repro",
+}
+_CHECKPOINT_TEMPLATE = (
+    json.dumps(_CHECKPOINT_PROTOTYPE, separators=(",", ":"))
+    .replace("@DIFF@", "synthetic-%d")
+    .replace("@FILE@", "f%05d.txt")
+    .replace('"@ATTRS@"', "%s")
+    .replace('"@TS@"', "%d")
+    .replace("@SESSION@", "session-%06d")
+    .encode("utf-8")
+    + b"\n"
+)
 
 
 def write_synthetic_checkpoints(
@@ -144,9 +390,7 @@ def write_synthetic_checkpoints(
     blobs_dir = working_dir / "blobs"
     blobs_dir.mkdir(parents=True, exist_ok=True)
 
-    base_content = "line0\nline1\nline2\n"
-    base_sha = hashlib.sha256(base_content.encode("utf-8")).hexdigest()
-    (blobs_dir / base_sha).write_text(base_content, encoding="utf-8")
+    (blobs_dir / _BASE_BLOB_SHA).write_text(_BASE_CONTENT, encoding="utf-8")
 
     attrs = [
         {
@@ -157,48 +401,93 @@ def write_synthetic_checkpoints(
         }
         for i in range(attrs_per_checkpoint)
     ]
+    attrs_bytes = _dumps(attrs)
+    tmpl = _CHECKPOINT_TEMPLATE
+
+    def _line(i: int) -> bytes:
+        return tmpl % (i, i % file_count, attrs_bytes, 1700000000 + i, i)
 
+    # Preallocate the extent and write through an mmap view so the file
+    # grows as memcpy into the page cache rather than via incremental
+    # buffered appends. The highest-index line is the longest, so sizing
+    # from it can never under-allocate; the file is truncated to the real
+    # length at the end.
     checkpoints_path = working_dir / "checkpoints.jsonl"
-    with checkpoints_path.open("w", encoding="utf-8") as f:
-        for i in range(checkpoint_count):
-            file_path = f"f{i % file_count:05d}.txt"
-            checkpoint = {
-                "kind": "AiAgent",
-                "diff": f"synthetic-{i}",
-                "author": "synthetic",
-                "entries": [
-                    {
-                        "file": file_path,
-                        "blob_sha": base_sha,
-                        "attributions": attrs,
-                        "line_attributions": [],
-                    }
-                ],
-                "timestamp": 1700000000 + i,
-                "transcript": None,
-                "agent_id": {
-                    "tool": "mock_ai",
-                    "id": f"session-{i:06d}",
-                    "model": "synthetic",
-                },
-                "agent_metadata": None,
-                "line_stats": {
-                    "additions": 1,
-                    "deletions": 0,
-                    "additions_sloc": 1,
-                    "deletions_sloc": 0,
-                },
-                "api_version": "checkpoint/1.0.0",
-                "git_ai_version": "repro",
-            }
-            f.write(json.dumps(checkpoint, separators=(",", ":")))
-            f.write("\n")
+    est = checkpoint_count * len(_line(checkpoint_count - 1)) if checkpoint_count else 0
+    fd = os.open(checkpoints_path, os.O_CREAT | os.O_RDWR | os.O_TRUNC, 0o644)
+    use_mmap = False
+    if est and hasattr(os, "posix_fallocate"):  # absent on macOS
+        try:
+            os.posix_fallocate(fd, 0, est)
+            use_mmap = True
+        except OSError:
+            pass
+    if use_mmap:
+        mm = mmap.mmap(fd, est)
+        try:
+            offset = 0
+            for i in range(checkpoint_count):
+                line = _line(i)
+                mm[offset:offset + len(line)] = line
+                offset += len(line)
+            mm.flush()
+        finally:
+            mm.close()
+        os.ftruncate(fd, offset)
+        os.close(fd)
+    else:
+        with os.fdopen(fd, "wb", buffering=4 * 1024 * 1024) as f:
+            f.writelines(_line(i) for i in range(checkpoint_count))
 
     target_file = repo_dir / "f00000.txt"
-    target_file.write_text(base_content + "change\n", encoding="utf-8")
+    target_file.write_text(_BASE_CONTENT + "change\n", encoding="utf-8")
     return checkpoints_path.stat().st_size / (1024.0 * 1024.0)
 
 
+def _write_transcript_chunk(
+    part_path: str,
+    start: int,
+    end: int,
+    thinking_bytes: int,
+) -> None:
+    """
+    Write transcript line pairs [start, end) to part_path. Top-level so it
+    pickles cleanly for ProcessPoolExecutor workers.
+    """
+    # Only the user message index varies per pair; the assistant line
+    # (thinking blob included) is identical every iteration. Serialize both
+    # once so the loop is a %-substitution and two buffered writes instead
+    # of re-escaping thinking_bytes of payload per line.
+    user = {
+        "type": "user",
+        "timestamp": "2026-02-11T00:00:00Z",
+        "message": {"content": "user-message-@I@"},
+    }
+    user_tmpl = (
+        json.dumps(user, separators=(",", ":"))
+        .replace("@I@", "%d")
+        .encode("utf-8")
+        + b"\n"
+    )
+    assistant = {
+        "type": "assistant",
+        "timestamp": "2026-02-11T00:00:01Z",
+        "message": {
+            "model": "claude-3-7-sonnet",
+            "content": [
+                {"type": "thinking", "thinking": "x" * thinking_bytes},
+                {"type": "text", "text": "ack"},
+            ],
+        },
+    }
+    assistant_line = _dumps(assistant) + b"\n"
+
+    with open(part_path, "wb", buffering=4 * 1024 * 1024) as f:
+        for i in range(start, end):
+            f.write(user_tmpl % i)
+            f.write(assistant_line)
+
+
 def write_large_claude_transcript(
     repo_dir: Path,
     *,
@@ -206,30 +495,33 @@ def write_large_claude_transcript(
     thinking_bytes: int,
 ) -> tuple[Path, float]:
     transcript_path = repo_dir / "claude-large.jsonl"
-    thinking_blob = "x" * thinking_bytes
-
-    with transcript_path.open("w", encoding="utf-8") as f:
-        for i in range(line_pairs):
-            user = {
-                "type": "user",
-                "timestamp": "2026-02-11T00:00:00Z",
-                "message": {"content": f"user-message-{i}"},
-            }
-            assistant = {
-                "type": "assistant",
-                "timestamp": "2026-02-11T00:00:01Z",
-                "message": {
-                    "model": "claude-3-7-sonnet",
-                    "content": [
-                        {"type": "thinking", "thinking": thinking_blob},
-                        {"type": "text", "text": "ack"},
-                    ],
-                },
-            }
-            f.write(json.dumps(user, separators=(",", ":")))
-            f.write("\n")
-            f.write(json.dumps(assistant, separators=(",", ":")))
-            f.write("\n")
+
+    workers = min(os.cpu_count() or 1, 8)
+    if workers <= 1 or line_pairs < 256:
+        _write_transcript_chunk(str(transcript_path), 0, line_pairs, thinking_bytes)
+    else:
+        # Serialize chunks in parallel worker processes, then stitch the
+        # part files together with large sequential copies.
+        chunk = -(-line_pairs // workers)
+        spans = [
+            (start, min(start + chunk, line_pairs))
+            for start in range(0, line_pairs, chunk)
+        ]
+        parts = [
+            repo_dir / f"claude-large.part{k}.jsonl" for k in range(len(spans))
+        ]
+        with ProcessPoolExecutor(max_workers=len(spans)) as pool:
+            futures = [
+                pool.submit(_write_transcript_chunk, str(part), start, end, thinking_bytes)
+                for part, (start, end) in zip(parts, spans)
+            ]
+            for future in futures:
+                future.result()
+        with open(transcript_path, "wb") as out:
+            for part in parts:
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, out, length=1 << 20)
+                part.unlink()
 
     # Ensure checkpoint path sees a changed file.
     (repo_dir / "f00000.txt").write_text("line0\nline1\nline2\nchanged\n", encoding="utf-8")
@@ -246,13 +538,14 @@ def run_checkpoint_repro(
     file_count: int,
     attrs_per_checkpoint: int,
     sample_interval_s: float,
+    sample_mode: str = "auto",
 ) -> RunMetrics:
     scenario_dir = root / f"checkpoints_attempt_{attempt}"
     if scenario_dir.exists():
         shutil.rmtree(scenario_dir)
-    scenario_dir.mkdir(parents=True, exist_ok=True)
 
-    head = make_repo(scenario_dir, file_count)
+    template = _ensure_template_repo(root, file_count)
+    head = clone_repo_from_template(template, scenario_dir)
     input_mb = write_synthetic_checkpoints(
         scenario_dir,
         head,
@@ -265,6 +558,7 @@ def run_checkpoint_repro(
         [str(git_ai_bin), "checkpoint"],
         cwd=scenario_dir,
         sample_interval_s=sample_interval_s,
+        sample_mode=sample_mode,
     )
 
     if returncode != 0:
@@ -297,24 +591,28 @@ def run_claude_repro(
     line_pairs: int,
     thinking_bytes: int,
     sample_interval_s: float,
+    sample_mode: str = "auto",
 ) -> RunMetrics:
     scenario_dir = root / f"claude_attempt_{attempt}"
     if scenario_dir.exists():
         shutil.rmtree(scenario_dir)
-    scenario_dir.mkdir(parents=True, exist_ok=True)
 
-    make_repo(scenario_dir, 1)
+    template = _ensure_template_repo(root, 1)
+    clone_repo_from_template(template, scenario_dir)
     transcript_path, input_mb = write_large_claude_transcript(
         scenario_dir,
         line_pairs=line_pairs,
         thinking_bytes=thinking_bytes,
     )
-    hook_payload = {
-        "transcript_path": str(transcript_path),
-        "cwd": str(scenario_dir),
-        "tool_input": {"file_path": "f00000.txt"},
-        "hook_event_name": "PostToolUse",
-    }
+    # Fixed-shape payload: only the two paths vary, so quote them with
+    # json.dumps and splice them into a literal template instead of
+    # building and serializing a dict per attempt.
+    hook_input = (
+        f'{{"transcript_path":{json.dumps(str(transcript_path))},'
+        f'"cwd":{json.dumps(str(scenario_dir))},'
+        f'"tool_input":{{"file_path":"f00000.txt"}},'
+        f'"hook_event_name":"PostToolUse"}}'
+    )
 
     returncode, peak_rss_mb, duration_s, log_path = measure_peak_rss(
         [
@@ -322,10 +620,11 @@ def run_claude_repro(
             "checkpoint",
             "claude",
             "--hook-input",
-            json.dumps(hook_payload, separators=(",", ":")),
+            hook_input,
         ],
         cwd=scenario_dir,
         sample_interval_s=sample_interval_s,
+        sample_mode=sample_mode,
     )
 
     if returncode != 0:
@@ -389,6 +688,16 @@ def main() -> int:
         default=25,
         help="RSS sample interval in milliseconds (default: 25).",
     )
+    parser.add_argument(
+        "--sample-mode",
+        choices=["auto", "getrusage", "statm", "ps"],
+        default="auto",
+        help=(
+            "Peak-RSS measurement strategy: getrusage (exact peak, no "
+            "sampling), statm (/proc polling), ps (portable polling), or "
+            "auto to choose per platform and interval (default: auto)."
+        ),
+    )
     parser.add_argument(
         "--target-peak-mb",
         type=float,
@@ -424,7 +733,7 @@ def main() -> int:
 
     work_root = Path(args.work_root).expanduser().resolve()
     if work_root.exists() and not args.keep_artifacts:
-        shutil.rmtree(work_root)
+        _parallel_rmtree(work_root)
     work_root.mkdir(parents=True, exist_ok=True)
 
     sample_interval_s = max(0.001, args.sample_interval_ms / 1000.0)
@@ -450,6 +759,7 @@ def main() -> int:
                         file_count=max(args.checkpoint_files, args.checkpoint_count * scale),
                         attrs_per_checkpoint=args.attrs_per_checkpoint,
                         sample_interval_s=sample_interval_s,
+                        sample_mode=args.sample_mode,
                     )
                 else:
                     metric = run_claude_repro(
@@ -459,6 +769,7 @@ def main() -> int:
                         line_pairs=args.claude_line_pairs * scale,
                         thinking_bytes=args.claude_thinking_bytes,
                         sample_interval_s=sample_interval_s,
+                        sample_mode=args.sample_mode,
                     )
 
                 all_metrics.append(metric)
@@ -492,7 +803,7 @@ def main() -> int:
         print(json.dumps(summary, indent=2))
     finally:
         if not args.keep_artifacts:
-            shutil.rmtree(work_root, ignore_errors=True)
+            _parallel_rmtree(work_root)
 
     return 0
 
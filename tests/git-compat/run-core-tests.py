@@ -17,8 +17,9 @@ import shlex
 import subprocess
 import sys
 import tempfile
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, List, Set, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_TESTS_FILE = REPO_ROOT / "tests" / "git-compat" / "core-tests.txt"
@@ -26,6 +27,35 @@ DEFAULT_WHITELIST = REPO_ROOT / "tests" / "git-compat" / "whitelist.csv"
 DEFAULT_GIT_URL = "https://github.com/git/git.git"
 DEFAULT_CLONE_DIR = Path("/tmp/git-core-tests")
 
+# Marker prove prints before its terminal failure summary.
+_SUMMARY_SENTINEL = "Test Summary Report"
+
+# Snapshot the environment once; each prove launch only layers its own
+# overrides on top instead of copying the full dict per call.
+_BASE_ENV = os.environ.copy()
+
+# Hoisted, anchored patterns for the summary parsers. Compiling once at import
+# keeps the hot loops free of re.compile churn; the header pattern tolerates
+# leading whitespace so callers don't need to strip() first.
+_HEADER_RE = re.compile(r"^\s*(t\d{4}-.+?\.sh)\s+\(Wstat:.*\)\s*$")
+_ISSUE_RE = re.compile(r"^\s*(Parse errors):\s*(.+)$")
+
+# Single-pass alternation over the whole summary block. One finditer call
+# keeps the per-line dispatch inside the C regex engine instead of a Python
+# loop over splitlines(); named groups drive a tiny state machine.
+_SUMMARY_RE = re.compile(
+    r"^\s*(?P<hdr>t\d{4}-.+?\.sh)\s+\(Wstat:[^\n]*$"
+    r"|^\s*Failed tests?:\s*(?P<failed>[^\n]+)$"
+    r"|^(?P<cont> {2,}[\d,\-\s.]+)$",
+    re.MULTILINE,
+)
+
+# Token handling for failed-index lists: split on separators, strip stray
+# punctuation, then validate 'N' or 'N-M' with a single fullmatch.
+_TOK_SPLIT_RE = re.compile(r"[,\s]+")
+_TOK_CLEAN_RE = re.compile(r"[^\d\-]")
+_TOK_RE = re.compile(r"(\d+)(?:-(\d+))?")
+
 
 def read_tests_list(path: Path) -> List[str]:
     tests: List[str] = []
@@ -40,7 +70,8 @@ def read_tests_list(path: Path) -> List[str]:
 
 
 def ensure_git_clone(clone_dir: Path, clone_url: str) -> None:
-    if clone_dir.exists():
+    # os.path checks on plain strings: one stat, no intermediate Path objects.
+    if os.path.isdir(os.fspath(clone_dir)):
         return
     clone_dir.parent.mkdir(parents=True, exist_ok=True)
     subprocess.run(
@@ -50,8 +81,7 @@ def ensure_git_clone(clone_dir: Path, clone_url: str) -> None:
 
 
 def ensure_git_build(clone_dir: Path, jobs: int) -> None:
-    build_options = clone_dir / "GIT-BUILD-OPTIONS"
-    if build_options.exists():
+    if os.path.isfile(os.path.join(os.fspath(clone_dir), "GIT-BUILD-OPTIONS")):
         return
     subprocess.run(
         [
@@ -67,9 +97,10 @@ def ensure_git_build(clone_dir: Path, jobs: int) -> None:
 
 
 def run_prove(git_tests_dir: Path, tests: List[str], git_installed: Path, jobs: int) -> Tuple[int, str]:
-    env = os.environ.copy()
-    env["GIT_TEST_INSTALLED"] = str(git_installed)
-    env.setdefault("GIT_TEST_DEFAULT_HASH", "sha1")
+    env = _BASE_ENV | {
+        "GIT_TEST_INSTALLED": str(git_installed),
+        "GIT_TEST_DEFAULT_HASH": _BASE_ENV.get("GIT_TEST_DEFAULT_HASH", "sha1"),
+    }
 
     cmd = ["prove", f"-j{jobs}"] + tests
     proc = subprocess.Popen(
@@ -79,85 +110,103 @@ def run_prove(git_tests_dir: Path, tests: List[str], git_installed: Path, jobs:
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
-        bufsize=1,
     )
 
-    combined_lines: List[str] = []
+    # Only the trailing 'Test Summary Report' block is kept (sentinel line
+    # included); everything before it is streamed to the terminal and
+    # discarded. Reading 64 KiB chunks instead of lines costs one Python
+    # iteration and one stdout write per chunk; the sentinel may straddle a
+    # chunk boundary, so keep a small tail window while searching for it.
+    summary_chunks: List[str] = []
+    tail = ""
+    in_summary = False
     assert proc.stdout is not None
-    for line in proc.stdout:
-        sys.stdout.write(line)
-        sys.stdout.flush()
-        combined_lines.append(line)
+    while True:
+        chunk = proc.stdout.read(65536)
+        if not chunk:
+            break
+        sys.stdout.write(chunk)
+        if in_summary:
+            summary_chunks.append(chunk)
+        else:
+            window = tail + chunk
+            idx = window.find(_SUMMARY_SENTINEL)
+            if idx != -1:
+                in_summary = True
+                summary_chunks.append(window[idx:])
+            else:
+                tail = window[-(len(_SUMMARY_SENTINEL) - 1):]
 
     proc.wait()
-    return proc.returncode, "".join(combined_lines)
+    return proc.returncode, "".join(summary_chunks)
 
 
 def extract_summary_section(prove_output: str) -> str:
-    m = re.search(r"(?ms)^Test Summary Report\n[-]+\n(.*)$", prove_output)
-    return m.group(1).strip() if m else ""
-
-
-def parse_failed_indices_list(s: str) -> Set[int]:
-    out: Set[int] = set()
-    for tok in re.split(r"[,\s]+", s.strip()):
+    # The marker sits near the end of the output, so a plain rfind plus a
+    # slice beats running a multiline regex over the whole transcript.
+    marker = _SUMMARY_SENTINEL + "\n"
+    idx = prove_output.rfind(marker)
+    if idx == -1:
+        return ""
+    # Skip the dashed underline that follows the sentinel line.
+    dash_end = prove_output.find("\n", idx + len(marker))
+    if dash_end == -1:
+        return ""
+    return prove_output[dash_end + 1:].strip()
+
+
+def parse_failed_indices_list(s: str) -> List[int]:
+    # Returns indices in input order; callers dedupe/sort once at the end
+    # rather than paying per-element set-hash costs here.
+    parts: List[range] = []
+    for tok in _TOK_SPLIT_RE.split(s.strip()):
         if not tok:
             continue
-        tok = tok.strip().rstrip(".")
-        tok = re.sub(r"[^\d\-]", "", tok)
-        if not tok:
+        tok = _TOK_CLEAN_RE.sub("", tok)
+        m = _TOK_RE.fullmatch(tok)
+        if not m:
             continue
-        if "-" in tok:
-            a, b = tok.split("-", 1)
-            if a.isdigit() and b.isdigit():
-                lo, hi = int(a), int(b)
-                if hi < lo:
-                    lo, hi = hi, lo
-                out.update(range(lo, hi + 1))
-        elif tok.isdigit():
-            out.add(int(tok))
-    return out
+        lo = int(m[1])
+        hi = int(m[2]) if m[2] else lo
+        if hi < lo:
+            lo, hi = hi, lo
+        parts.append(range(lo, hi + 1))
+    return list(chain.from_iterable(parts))
 
 
 def parse_failures(summary_text: str) -> Dict[str, List[int]]:
-    failures: Dict[str, Set[int]] = {}
-    lines = summary_text.splitlines()
-    i = 0
+    # Accumulate into plain lists (prove doesn't repeat indices within a
+    # block); dedupe and sort once per script at the end.
+    failures: Dict[str, List[int]] = {}
     current = None
-
-    header_re = re.compile(r"^(t\d{4}-.+?\.sh)\s+\(Wstat:.*\)$")
-    failed_re = re.compile(r"^\s*Failed tests?:\s*(.+)$")
-
-    while i < len(lines):
-        line = lines[i].rstrip("\n")
-        header = header_re.match(line.strip())
-        if header:
-            current = header.group(1)
-            failures.setdefault(current, set())
-            i += 1
+    # Offset just past the last 'Failed test(s):' or accepted continuation
+    # line; -2 can never abut a match start.
+    cont_anchor = -2
+
+    for m in _SUMMARY_RE.finditer(summary_text):
+        hdr = m.group("hdr")
+        if hdr is not None:
+            current = hdr
+            failures.setdefault(current, [])
+            cont_anchor = -2
             continue
+        if current is None:
+            continue
+        failed = m.group("failed")
+        if failed is not None:
+            failures[current].extend(parse_failed_indices_list(failed))
+            cont_anchor = m.end()
+            continue
+        # Wrapped numeric continuation lines only count when they start on
+        # the line directly after the previous 'Failed test(s):' (or
+        # continuation) line. Non-matching lines in between (Tests skipped:,
+        # TODO passed:, ...) never appear in the match stream, so adjacency
+        # has to be checked via offsets rather than a boolean flag.
+        if m.start() == cont_anchor + 1:
+            failures[current].extend(parse_failed_indices_list(m.group("cont")))
+            cont_anchor = m.end()
 
-        if current:
-            m = failed_re.match(line)
-            if m:
-                first = m.group(1).strip()
-                j = i + 1
-                cont_parts: List[str] = []
-                while j < len(lines):
-                    nxt = lines[j]
-                    if re.match(r"^\s{2,}[\d,\-\s\.]+$", nxt):
-                        cont_parts.append(nxt.strip())
-                        j += 1
-                    else:
-                        break
-                full = ", ".join([first] + cont_parts) if cont_parts else first
-                failures[current].update(parse_failed_indices_list(full))
-                i = j
-                continue
-
-        i += 1
-
-    return {k: sorted(v) for k, v in failures.items()}
+    return {k: sorted(set(v)) for k, v in failures.items()}
 
 
 def parse_summary_issues(summary_text: str) -> Dict[str, List[str]]:
@@ -165,19 +214,18 @@ def parse_summary_issues(summary_text: str) -> Dict[str, List[str]]:
     lines = summary_text.splitlines()
     i = 0
     current = None
-    header_re = re.compile(r"^(t\d{4}-.+?\.sh)\s+\(Wstat:.*\)$")
-    issue_re = re.compile(r"^\s*(Parse errors):\s*(.+)$")
 
     while i < len(lines):
         line = lines[i].rstrip("\n")
-        header = header_re.match(line.strip())
-        if header:
-            current = header.group(1)
-            issues.setdefault(current, [])
-            i += 1
-            continue
-        if current:
-            match = issue_re.match(line)
+        if "Wstat:" in line:
+            header = _HEADER_RE.match(line)
+            if header:
+                current = header.group(1)
+                issues.setdefault(current, [])
+                i += 1
+                continue
+        if current and "Parse errors:" in line:
+            match = _ISSUE_RE.match(line)
             if match:
                 label, detail = match.groups()
                 issues[current].append(f"{label}: {detail}")
@@ -185,34 +233,42 @@ def parse_summary_issues(summary_text: str) -> Dict[str, List[str]]:
     return {k: v for k, v in issues.items() if v}
 
 
-def load_whitelist(path: Path) -> Dict[str, Set[int]]:
+def load_whitelist(path: Path) -> Dict[str, FrozenSet[int]]:
     whitelist: Dict[str, Set[int]] = {}
     if not path.exists():
-        return whitelist
+        return {}
     with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        # Plain csv.reader with column indices resolved from the header
+        # once — no per-row dict construction like DictReader.
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return whitelist
+        fi = header.index("file")
+        ti = header.index("test") if "test" in header else header.index("tests")
+        width = max(fi, ti)
         for row in reader:
-            file_key = (row.get("file") or "").strip().strip('"')
-            tests_field = (row.get("test") or row.get("tests") or "").strip().strip('"')
+            if len(row) <= width:
+                continue
+            file_key = row[fi].strip().strip('"')
+            tests_field = row[ti].strip().strip('"')
             if not file_key or not tests_field:
                 continue
             indices = parse_failed_indices_list(tests_field)
             if not indices:
                 continue
             whitelist.setdefault(file_key, set()).update(indices)
-    return whitelist
+    # Freeze once so filtering can use C-level set difference.
+    return {k: frozenset(v) for k, v in whitelist.items()}
 
 
-def apply_whitelist(failures: Dict[str, List[int]], whitelist: Dict[str, Set[int]]) -> Dict[str, List[int]]:
+def apply_whitelist(failures: Dict[str, List[int]], whitelist: Dict[str, FrozenSet[int]]) -> Dict[str, List[int]]:
     if not whitelist:
         return failures
     filtered: Dict[str, List[int]] = {}
     for test_name, indices in failures.items():
         wl = whitelist.get(test_name)
-        if wl:
-            remaining = [i for i in indices if i not in wl]
-        else:
-            remaining = list(indices)
+        remaining = sorted(set(indices) - wl) if wl else list(indices)
         if remaining:
             filtered[test_name] = remaining
     return filtered
@@ -244,9 +300,16 @@ def main() -> int:
     parser.add_argument("--git-ai-bin", type=Path, default=REPO_ROOT / "target" / "release" / "git-ai")
     args = parser.parse_args()
 
+    # Line-buffer stdout once up front instead of flushing after every echoed
+    # chunk of prove output (matters when output is piped, e.g. in CI).
+    sys.stdout.reconfigure(line_buffering=True)
+
     tests = read_tests_list(args.tests_file)
 
-    if not args.git_ai_bin.exists():
+    # Stringify the frequently passed paths once instead of re-converting
+    # (and re-stat'ing via Path) around each subprocess launch.
+    git_ai_bin_str = os.fspath(args.git_ai_bin)
+    if not os.path.isfile(git_ai_bin_str):
         raise FileNotFoundError(
             f"git-ai binary not found at {args.git_ai_bin}. Build it with `cargo build --release`."
         )
@@ -255,15 +318,15 @@ def main() -> int:
     ensure_git_build(args.clone_dir, args.jobs)
     git_tests_dir = args.clone_dir / "t"
 
-    if not git_tests_dir.exists():
+    if not os.path.isdir(os.fspath(git_tests_dir)):
         raise FileNotFoundError(f"Git tests directory not found at {git_tests_dir}")
 
     whitelist = load_whitelist(args.whitelist)
 
     with tempfile.TemporaryDirectory() as tmpdir:
         wrapper_dir = Path(tmpdir)
-        (wrapper_dir / "git").symlink_to(args.git_ai_bin)
-        (wrapper_dir / "git-ai").symlink_to(args.git_ai_bin)
+        (wrapper_dir / "git").symlink_to(git_ai_bin_str)
+        (wrapper_dir / "git-ai").symlink_to(git_ai_bin_str)
 
         cmd_preview = " ".join(shlex.quote(t) for t in tests)
         print(f"[+] Running core Git tests with: prove -j{args.jobs} {cmd_preview}")